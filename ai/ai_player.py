@@ -1,35 +1,88 @@
 # -*- coding: utf-8 -*-
 """AI玩家决策逻辑"""
 
+import json
 import random
 
+# 可调的决策参数（参数优化与策略文件使用）
+PARAM_NAMES = ("buy_probability", "cash_reserve", "upgrade_probability", "sell_cheapest_first")
+
 
 class AIPlayer:
-    """AI玩家决策器"""
-    
-    @staticmethod
-    def decide_buy_property(player, property_obj):
+    """
+    AI玩家决策器
+    决策参数可配置，不同参数组合即不同策略，以strategy_id区分
+    """
+
+    def __init__(self, strategy_id="default", buy_probability=0.7, cash_reserve=500,
+                 upgrade_probability=0.7, sell_cheapest_first=True):
+        self.strategy_id = strategy_id
+        self.buy_probability = buy_probability
+        self.cash_reserve = cash_reserve
+        self.upgrade_probability = upgrade_probability
+        self.sell_cheapest_first = sell_cheapest_first
+
+    def params(self):
+        """决策参数字典（可用AIPlayer(strategy_id, **params)重建）"""
+        return {name: getattr(self, name) for name in PARAM_NAMES}
+
+    def decide_buy_property(self, player, property_obj, rng=random):
         """
         决定是否购买地产
-        策略：如果现金充足且价格合理，有70%概率购买
+        策略：如果现金充足且价格合理，按buy_probability概率购买（默认70%）
         """
         if not player.can_afford(property_obj.base_price):
             return False
-            
+
         # 保留一定现金，不全部花光
-        if player.cash - property_obj.base_price < 500:
+        if player.cash - property_obj.base_price < self.cash_reserve:
             return False
-            
-        # 70%概率购买
-        return random.random() > 0.3
-        
-    @staticmethod
-    def choose_property_to_sell(player):
+
+        return rng.random() > 1 - self.buy_probability
+
+    def decide_upgrade(self, player, property_obj, upgrade_cost, rng=random):
+        """决定是否升级地产（调用前已确认现金足够），默认70%概率升级"""
+        return rng.random() > 1 - self.upgrade_probability
+
+    def choose_property_to_sell(self, player):
         """
         选择要出售的地产
-        策略：出售价值最低的地产
+        策略：默认出售价值最低的地产，否则出售价值最高的
         """
         if not player.properties:
             return None
-        return min(player.properties, key=lambda prop: prop.property_price)
+        if self.sell_cheapest_first:
+            return min(player.properties, key=lambda prop: prop.property_price)
+        return max(player.properties, key=lambda prop: prop.property_price)
+
+
+# 默认策略（未指定策略的AI玩家使用）
+DEFAULT_STRATEGY = AIPlayer()
+
+# 预置策略，供锦标赛与参数扫描按名称引用
+STRATEGIES = {
+    "default": DEFAULT_STRATEGY,
+    "cautious": AIPlayer("cautious", buy_probability=0.5, cash_reserve=5000, upgrade_probability=0.3),
+    "aggressive": AIPlayer("aggressive", buy_probability=1.0, cash_reserve=0, upgrade_probability=1.0),
+}
+# 预置策略名（STRATEGIES之后还会加入load_strategies登记的策略）
+BUILTIN_STRATEGIES = tuple(STRATEGIES)
+
+
+def load_strategies(path):
+    """从策略文件（simulation.evolve的输出）登记策略，返回登记的策略名列表"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    names = []
+    for entry in data["strategies"]:
+        STRATEGIES[entry["strategy_id"]] = AIPlayer(entry["strategy_id"], **entry["params"])
+        names.append(entry["strategy_id"])
+    return names
+
 
+def get_strategy(strategy_id):
+    """按名称获取预置策略"""
+    try:
+        return STRATEGIES[strategy_id]
+    except KeyError:
+        raise ValueError(f"未知策略: {strategy_id}") from None
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""前瞻搜索AI
+
+在买入与升级决策点，对“做”与“不做”分别进行期望值搜索（expectimax）：
+选项的后果在一个副本对局上用真实的游戏逻辑执行，之后每一层是一名玩家的回合，
+枚举骰子的六种点数取平均；回合内的决策由各玩家的基础策略完成，机会事件等其余随机性
+取副本随机数生成器的当前状态。叶子局面按本方价值（现金、地价与预期租金）占比评估，
+对局结束时按胜负计1或0。
+
+搜索按迭代加深在时间预算内进行，采用最后一个完整完成的深度的结果。
+局面评估按局面哈希缓存在置换表中（见managers.zobrist与ai.transposition），
+不同骰子顺序到达的相同局面以及上一次决策已搜索过的局面不再重复展开。
+本游戏中途经地块的事件使不同顺序的局面大多不同，实测深度4时可省去的展开只有约2%。
+"""
+
+import random
+import time
+from ai.ai_player import AIPlayer
+from ai.transposition import TranspositionTable
+from managers import game_state
+from simulation.checkpoint import capture_game, resume_game
+
+DICE_FACES = range(1, 7)
+RENT_WEIGHT = 16.0       # 叶子评估中每块地产额外计入的租金次数
+LEVEL_GROWTH = 1.2       # 每级地产每次收租时地价的涨幅
+
+
+class _Timeout(Exception):
+    """超出本次决策的时间预算"""
+
+
+class _Forced(AIPlayer):
+    """按给定结果作出买入或升级决策，其余决策同基础策略"""
+
+    def __init__(self, base, decision):
+        super().__init__(base.strategy_id, **base.params())
+        self.decision = decision
+
+    def decide_buy_property(self, player, property_obj, rng=random):
+        return self.decision
+
+    def decide_upgrade(self, player, property_obj, upgrade_cost, rng=random):
+        return self.decision
+
+
+class LookaheadAI(AIPlayer):
+    """
+    前瞻搜索策略（绑定到一局对局）
+    决策参数同AIPlayer，用于搜索树中本方的其余决策以及没有完成任何深度时的后备决策；
+    policy为置换表的替换策略，None表示不使用置换表
+    """
+
+    def __init__(self, game, strategy_id="lookahead", time_budget=0.05, max_depth=8,
+                 policy="two_tier", capacity=1 << 16, rent_weight=RENT_WEIGHT, **params):
+        super().__init__(strategy_id, **params)
+        self.game = game
+        self.time_budget = time_budget     # 每次决策的搜索秒数
+        self.max_depth = max_depth         # 最大搜索层数（每层一名玩家的回合）
+        self.rent_weight = rent_weight
+        self.table = TranspositionTable(capacity, policy) if policy else None
+        self.base = AIPlayer(strategy_id, **params)
+        self._scratch = None
+        # 统计
+        self.decisions = 0
+        self.depth_total = 0               # 各次决策完成的深度之和
+        self.nodes = 0                     # 展开的回合数
+
+    def decide_buy_property(self, player, property_obj, rng=random):
+        # 保留现金的约束同基础策略，搜索只取代按概率买入
+        if player.cash - property_obj.base_price < self.cash_reserve:
+            return False
+        decision = self._search()
+        if decision is None:
+            return self.base.decide_buy_property(player, property_obj, rng)
+        return decision
+
+    def decide_upgrade(self, player, property_obj, upgrade_cost, rng=random):
+        decision = self._search()
+        if decision is None:
+            return self.base.decide_upgrade(player, property_obj, upgrade_cost, rng)
+        return decision
+
+    def mean_depth(self):
+        return self.depth_total / self.decisions if self.decisions else 0.0
+
+    def _scratch_game(self):
+        """搜索用的副本对局：所有座位由AI决策，前瞻AI替换为其基础策略"""
+        if self._scratch is None:
+            scratch = game_state.build_game(game_state.describe_game(self.game))
+            for copy, player in zip(scratch.players, self.game.players):
+                copy.is_ai = True
+                strategy = self.game.get_strategy(player)
+                copy.strategy = strategy.base if isinstance(strategy, LookaheadAI) else strategy
+            if self.table is not None:
+                scratch.enable_hashing()
+            self._scratch = scratch
+        return self._scratch
+
+    def _search(self):
+        """对当前决策点迭代加深搜索，返回是否执行该选项；一层也未完成时返回None"""
+        game = self.game
+        scratch = self._scratch_game()
+        seat = game.current_player_index
+        # AI的决策点没有等待决策、待付款等回合内状态，可以像回合之间一样保存
+        root = capture_game(game)
+        deadline = time.perf_counter() + self.time_budget
+        decision = None
+        completed = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                skip, take = (self._option_value(scratch, root, seat, option, depth, deadline)
+                              for option in (False, True))
+            except _Timeout:
+                break
+            decision = take > skip
+            completed = depth
+        self.decisions += 1
+        self.depth_total += completed
+        return decision
+
+    def _option_value(self, scratch, root, seat, option, depth, deadline):
+        """执行选项并结束本回合，返回之后depth-1层搜索的期望评估"""
+        resume_game(scratch, root)
+        player = scratch.players[seat]
+        base = player.strategy
+        player.strategy = _Forced(base, option)
+        scratch.process_tile_event()
+        player.strategy = base
+        scratch.next_turn()
+        return self._value(scratch, seat, depth - 1, deadline)
+
+    def _value(self, scratch, seat, depth, deadline):
+        """副本对局当前局面向后depth层的期望评估"""
+        if scratch.game_over or depth == 0:
+            return self._evaluate(scratch, seat)
+        key = None
+        if self.table is not None:
+            key = scratch.state_hash()
+            entry = self.table.probe(key)
+            if entry is not None and entry[0] >= depth:
+                return entry[1]
+        if time.perf_counter() >= deadline:
+            raise _Timeout
+        data = capture_game(scratch)
+        total = 0.0
+        for dice in DICE_FACES:
+            if dice != DICE_FACES[0]:
+                resume_game(scratch, data)
+            scratch.play_ai_turn(dice)
+            self.nodes += 1
+            total += self._value(scratch, seat, depth - 1, deadline)
+        value = total / len(DICE_FACES)
+        if key is not None:
+            self.table.store(key, depth, value)
+        return value
+
+    def _evaluate(self, game, seat):
+        """本方视角的局面评估：对局结束按胜负计，否则为本方占存活玩家总价值的比例"""
+        if game.game_over:
+            return float(game.winner is not None and game.winner.seat == seat)
+        player = game.players[seat]
+        if not player.alive:
+            return 0.0
+        values = [self._player_value(p) if p.alive else 0 for p in game.players]
+        total = sum(values)
+        return values[seat] / total if total else 0.0
+
+    def _player_value(self, player):
+        # 地产除地价外再计rent_weight次租金，近似搜索视野之外的租金收入；
+        # 每次收租地价按等级上涨（见Property.update_property_price），等级高的地产租金增长快。
+        # 不能调用get_rent，它会更新地价
+        value = player.cash
+        for prop in player.properties:
+            rent = prop.property_price * prop.rent_rate * LEVEL_GROWTH ** prop.level
+            value += prop.property_price + self.rent_weight * rent
+        return max(0, value)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""置换表：按局面哈希缓存局面评估
+
+容量固定（2的幂），按哈希的低位定位槽位，表满后按替换策略覆盖旧条目：
+- always: 新条目总是覆盖
+- depth: 只有搜索深度不低于旧条目时才覆盖（保留昂贵的深层结果）
+- two_tier: 每个桶两个槽，一个按深度替换，一个总是覆盖；
+  深度槽被更深的结果替换时，旧条目降到另一个槽
+条目保存完整的64位键，哈希低位相同的不同局面不会误命中。
+"""
+
+POLICIES = ("always", "depth", "two_tier")
+
+
+class TranspositionTable:
+    """定长置换表"""
+
+    def __init__(self, capacity=1 << 16, policy="two_tier"):
+        if capacity < 2 or capacity & (capacity - 1):
+            raise ValueError("capacity必须是不小于2的2的幂")
+        if policy not in POLICIES:
+            raise ValueError(f"未知的替换策略: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self._ways = 2 if policy == "two_tier" else 1
+        self._mask = capacity // self._ways - 1
+        self.keys = [None] * capacity
+        self.depths = [0] * capacity
+        self.values = [None] * capacity
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0    # 覆盖了其他局面的条目
+        self.rejected = 0      # 按深度替换时放弃写入
+
+    def __len__(self):
+        return self.capacity - self.keys.count(None)
+
+    def clear(self):
+        self.keys = [None] * self.capacity
+        self.depths = [0] * self.capacity
+        self.values = [None] * self.capacity
+
+    def probe(self, key):
+        """查找局面，命中时返回 (深度, 评估值)，否则返回None"""
+        slot = (key & self._mask) * self._ways
+        for slot in range(slot, slot + self._ways):
+            if self.keys[slot] == key:
+                self.hits += 1
+                return self.depths[slot], self.values[slot]
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value):
+        """写入局面的评估（depth为得到该评估的剩余搜索深度）"""
+        slot = (key & self._mask) * self._ways
+        self.stores += 1
+        if self.policy == "always":
+            self._write(slot, key, depth, value)
+        elif self.policy == "depth":
+            if self.keys[slot] is None or self.keys[slot] == key or depth >= self.depths[slot]:
+                self._write(slot, key, depth, value)
+            else:
+                self.rejected += 1
+        else:
+            old = self.keys[slot]
+            if old is None or old == key or depth >= self.depths[slot]:
+                if old is not None and old != key:
+                    # 深度槽的旧条目降到总是覆盖的槽
+                    self._write(slot + 1, old, self.depths[slot], self.values[slot])
+                elif self.keys[slot + 1] == key:
+                    self.keys[slot + 1] = None
+                self._write(slot, key, depth, value)
+            else:
+                self._write(slot + 1, key, depth, value)
+
+    def _write(self, slot, key, depth, value):
+        if self.keys[slot] is not None and self.keys[slot] != key:
+            self.overwrites += 1
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """游戏配置文件"""
 
+import os
+
 # 窗口设置
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -8,9 +10,21 @@ FPS = 60
 
 # 游戏设置
 START_CASH = 50000          # 初始现金
+NUM_HUMAN_PLAYERS = 1       # 默认人类玩家数
+NUM_AI_PLAYERS = 1          # 默认AI玩家数
+MIN_PLAYERS = 2
+MAX_PLAYERS = 64
 START_BONUS = 0             # 经过起点奖励（已废弃，保留字段以兼容旧逻辑）
 TOTAL_TILES = 24           # 地块总数
 
+# 大地图布局缓存（按(地块数, 种子)保存到磁盘并以内存映射加载）
+LAYOUT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "boards")
+LAYOUT_CACHE_MIN_TILES = 1000   # 地块数达到该值才使用磁盘缓存
+
+# 字体（按顺序匹配，解析出的字体文件路径缓存到磁盘，避免每次启动扫描系统字体）
+FONT_NAMES = "microsoftyahei,simsun,simhei,arial"
+FONT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "font.json")
+
 # 利息与税率设置
 INITIAL_INTEREST_RATE = 0.05
 INITIAL_TAX_RATE = 0.01
@@ -52,6 +66,27 @@ BOARD_CENTER_Y = 400
 BOARD_RADIUS = 300
 TILE_SIZE = 30
 
+# 视图设置（缩放/平移与细节层级）
+CAMERA_MIN_ZOOM = 0.25
+CAMERA_MAX_ZOOM = 20000.0
+CAMERA_ZOOM_STEP = 1.25          # 每格滚轮的缩放倍数
+LOD_MIN_TILE_SPACING = 4         # 屏幕上相邻地块间距小于该像素数时抽稀绘制
+LOD_TEXT_MIN_TILE_SIZE = 24      # 地块屏幕尺寸小于该像素数时不绘制文字
+
+# 录像设置
+REPLAY_KEYFRAME_INTERVAL = 50    # 每隔多少回合保存一个完整关键帧
+REPLAY_MAX_SPEED = 8192          # 回放最高速度（回合/秒）
+
+# AI行动节拍（与帧率无关）
+AI_STEP_INTERVAL = 0.5           # 1×速度下AI每步行动的间隔秒数
+AI_SPEED_PRESETS = (1, 10, None) # 速度档位（按键1/2/3切换），None为最高速度
+AI_MAX_SPEED_FRAME_BUDGET = 0.010  # 最高速度下每帧用于推进AI的秒数，其余时间用于渲染
+
+# 胜率估计设置（后台推演）
+WIN_ESTIMATE_ROLLOUTS = 400      # 每个回合状态的推演次数上限
+WIN_ESTIMATE_BATCH = 8           # 每批推演次数（状态改变时最多浪费一批）
+WIN_ESTIMATE_HORIZON = 500       # 推演回合数上限，未分胜负时按财富领先者计
+
 # UI设置
 INFO_PANEL_X = 1000
 INFO_PANEL_Y = 50
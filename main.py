@@ -4,22 +4,30 @@
 import pygame
 import sys
 from managers.game_manager import GameManager
+from managers.game_session import GameSession
+from simulation.win_probability import WinEstimator
 from ui.renderer import Renderer
+from ui.camera import Camera
+from ui.fonts import init_display
+from ui.scheduler import StepScheduler
 from config import *
 
 
 class MonopolyGame:
     """大富翁游戏主类"""
     
-    def __init__(self):
-        pygame.init()
+    def __init__(self, session=None, estimate_workers=None):
+        init_display()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("大富翁游戏")
         self.clock = pygame.time.Clock()
         
-        # 初始化管理器
-        self.game_manager = GameManager()
+        # 初始化管理器（传入远程会话时作为瘦客户端，游戏逻辑在服务器上运行）
+        self.remote = session is not None
+        self.session = session if session is not None else GameSession(GameManager())
+        self.game_manager = self.session.game_manager
         self.renderer =Renderer(self.screen)
+        self.camera = Camera((0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
         
         # UI元素
         self.roll_button = pygame.Rect(INFO_PANEL_X, 450, BUTTON_WIDTH, BUTTON_HEIGHT)
@@ -30,8 +38,11 @@ class MonopolyGame:
         self.upgrade_skip_button = pygame.Rect(INFO_PANEL_X, 750, BUTTON_WIDTH, BUTTON_HEIGHT)
         self.sell_buttons = []
         
-        self.action_taken = False
-        self.ai_auto_play_delay = 0
+        # AI行动按时间调度（与帧率无关），可切换倍速
+        self.ai_scheduler = StepScheduler()
+        
+        # 后台胜率估计（estimate_workers为0时不启用，None时按CPU核数选择）
+        self.win_estimator = WinEstimator(estimate_workers) if estimate_workers != 0 else None
         
     def run(self):
         """游戏主循环"""
@@ -39,126 +50,117 @@ class MonopolyGame:
         
         while running:
             # 控制帧率
-            self.clock.tick(FPS)
+            dt = self.clock.tick(FPS) / 1000.0
             
             # 处理事件
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     self.handle_mouse_click(event.pos)
+                elif event.type == pygame.MOUSEWHEEL:
+                    # 滚轮缩放
+                    self.camera.zoom_at(CAMERA_ZOOM_STEP ** event.y, pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                    # 右键拖动平移
+                    self.camera.pan(*event.rel)
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_key(event.key)
                     
+            # 远程模式：接收服务器推送的状态
+            if self.remote:
+                self.session.poll()
+                self.game_manager = self.session.game_manager
+
             # AI自动行动
-            if not self.game_manager.game_over:
-                current_player = self.game_manager.get_current_player()
-                if (current_player.is_ai 
-                        and not self.game_manager.waiting_for_buy_decision
-                        and not self.game_manager.waiting_for_sell_decision):
-                    self.ai_auto_play_delay += 1
-                    if self.ai_auto_play_delay > 30:  # 1秒延迟
-                        if not self.action_taken:
-                            self.game_manager.roll_dice()
-                            result = self.game_manager.process_tile_event()
-                            if result == "end_turn":
-                                self.action_taken = False
-                                self.game_manager.next_turn()
-                            else:
-                                self.action_taken = True
-                        else:
-                            self.action_taken = False
-                            self.game_manager.next_turn()
-                        self.ai_auto_play_delay = 0
+            self.play_ai(dt)
+                    
+            # 收取已完成的胜率推演并补充新批次（不等待）；回合中途的状态不交给推演
+            if self.win_estimator is not None:
+                status = self.session.status()
+                mid_turn = status is not None and (status["action_taken"] or status["waiting"] is not None)
+                self.win_estimator.poll(self.game_manager, mid_turn)
                         
             # 渲染
             self.render()
             
+        if self.win_estimator is not None:
+            self.win_estimator.close()
         pygame.quit()
         sys.exit()
         
+    def play_ai(self, dt):
+        """按调度器推进AI行动（最高速度下一帧推进多步，只渲染最新状态）"""
+        if not self.session.ai_can_act():
+            self.ai_scheduler.reset()   # 等待人类操作期间不累积AI节拍
+            return
+        for _ in self.ai_scheduler.steps(dt):
+            if not self.session.ai_can_act():
+                break
+            self.session.step_ai()
+            
+    def handle_key(self, key):
+        """处理键盘操作"""
+        if key == pygame.K_HOME:
+            self.camera.reset()
+        elif pygame.K_1 <= key < pygame.K_1 + len(AI_SPEED_PRESETS):
+            self.ai_scheduler.speed = AI_SPEED_PRESETS[key - pygame.K_1]
+            
     def handle_mouse_click(self, pos):
         """处理鼠标点击"""
         if self.game_manager.game_over:
             return
             
-        current_player = self.game_manager.get_current_player()
-        
         # 只有玩家回合才能点击
-        if current_player.is_ai:
+        if not self.session.is_human_turn():
             return
         
         # 升级按钮
-        if self.game_manager.waiting_for_upgrade_decision:
-            if self.upgrade_button.collidepoint(pos):
-                self.game_manager.player_upgrade_decision(True)
-                self.action_taken = True
-                return
-            elif self.upgrade_skip_button.collidepoint(pos):
-                self.game_manager.player_upgrade_decision(False)
-                self.action_taken = True
-                return
+        if self.upgrade_button.collidepoint(pos):
+            self.session.apply("upgrade")
+        elif self.upgrade_skip_button.collidepoint(pos):
+            self.session.apply("skip_upgrade")
             
         # 出售地产按钮
-        if self.game_manager.waiting_for_sell_decision:
-            for rect, tile_index in self.sell_buttons:
-                if rect.collidepoint(pos):
-                    result = self.game_manager.sell_property(current_player, tile_index)
-                    if result == "paid":
-                        followup = self.game_manager.handle_post_payment()
-                        if followup == "end_turn":
-                            self.action_taken = True
-                        elif followup == "wait":
-                            # 等待新的事件处理，例如购买决策
-                            pass
-                        else:
-                            if followup == "end_turn":
-                                self.action_taken = True
-                    elif result == "bankrupt":
-                        self.action_taken = True
-                    return
+        for rect, tile_index in self.sell_buttons:
+            if rect.collidepoint(pos):
+                self.session.apply("sell", tile_index)
+                return
         
         # 投掷骰子按钮
-        if self.roll_button.collidepoint(pos) and not self.action_taken:
-            self.game_manager.roll_dice()
-            result = self.game_manager.process_tile_event()
-            if result == "end_turn":
-                self.action_taken = True
-            elif result == "wait":
-                # 等待玩家决策
-                pass
+        if self.roll_button.collidepoint(pos):
+            self.session.apply("roll")
                 
         # 购买按钮
-        elif self.buy_button.collidepoint(pos) and self.game_manager.waiting_for_buy_decision:
-            self.game_manager.player_buy_decision(True)
-            self.action_taken = True
+        elif self.buy_button.collidepoint(pos):
+            self.session.apply("buy")
             
         # 跳过按钮
-        elif self.skip_button.collidepoint(pos) and self.game_manager.waiting_for_buy_decision:
-            self.game_manager.player_buy_decision(False)
-            self.action_taken = True
+        elif self.skip_button.collidepoint(pos):
+            self.session.apply("skip")
             
         # 结束回合按钮
-        elif self.end_turn_button.collidepoint(pos) and self.action_taken:
-            self.game_manager.next_turn()
-            self.action_taken = False
+        elif self.end_turn_button.collidepoint(pos):
+            self.session.apply("end_turn")
             
     def render(self):
         """渲染游戏画面"""
         self.screen.fill(WHITE)
         
-        # 绘制地图
-        for tile in self.game_manager.board.tiles:
-            self.renderer.draw_tile(tile)
+        # 绘制地图（仅视口内地块）
+        self.renderer.draw_board(self.game_manager.board, self.camera)
             
         # 绘制玩家
-        for player in self.game_manager.players:
-            pos = self.game_manager.board.get_player_position(
-                player.position, player.is_ai
-            )
-            self.renderer.draw_player(pos, player.color, player.is_ai)
+        self.renderer.draw_players(self.game_manager.board, self.game_manager.players, self.camera)
             
-        # 绘制信息面板
-        self.renderer.draw_info_panel(self.game_manager.human_player, INFO_PANEL_X, 50, self.game_manager.cpi)
-        self.renderer.draw_info_panel(self.game_manager.ai_player, INFO_PANEL_X, 250, self.game_manager.cpi)
+        # 绘制信息面板（胜率取最近一次完成的估计）
+        estimate = self.win_estimator.estimate if self.win_estimator is not None else None
+        self.renderer.draw_info_panels(
+            self.game_manager.players,
+            self.game_manager.get_current_player(),
+            self.game_manager.cpi,
+            estimate[0] if estimate is not None else None
+        )
         
         # 绘制消息
         current_player = self.game_manager.get_current_player()
@@ -166,48 +168,49 @@ class MonopolyGame:
         self.renderer.draw_messages(self.game_manager.messages, 700, 50, is_player_turn)
         
         # 绘制按钮
-        current_player = self.game_manager.get_current_player()
-        is_player_turn = not current_player.is_ai
+        status = self.session.status()
+        is_player_turn = self.session.is_human_turn()
+        waiting = status["waiting"] if is_player_turn else None
+        action_taken = status["action_taken"]
         
         self.renderer.draw_button(
             self.roll_button, 
             "投掷骰子", 
-            is_player_turn and not self.action_taken and not self.game_manager.game_over
+            is_player_turn and not action_taken and waiting is None
         )
         
-        if self.game_manager.waiting_for_buy_decision:
-            self.renderer.draw_button(self.buy_button, "购买", True)
-            self.renderer.draw_button(self.skip_button, "跳过", True)
-        else:
-            self.renderer.draw_button(self.buy_button, "购买", False)
-            self.renderer.draw_button(self.skip_button, "跳过", False)
+        self.renderer.draw_button(self.buy_button, "购买", waiting == "buy")
+        self.renderer.draw_button(self.skip_button, "跳过", waiting == "buy")
         
         # 升级按钮
-        if self.game_manager.waiting_for_upgrade_decision:
-            self.renderer.draw_button(self.upgrade_button, "升级", True)
-            self.renderer.draw_button(self.upgrade_skip_button, "跳过", True)
-        else:
-            self.renderer.draw_button(self.upgrade_button, "升级", False)
-            self.renderer.draw_button(self.upgrade_skip_button, "跳过", False)
+        self.renderer.draw_button(self.upgrade_button, "升级", waiting == "upgrade")
+        self.renderer.draw_button(self.upgrade_skip_button, "跳过", waiting == "upgrade")
             
         self.renderer.draw_button(
             self.end_turn_button, 
             "结束回合", 
-            is_player_turn and self.action_taken
+            is_player_turn and action_taken and waiting is None
         )
         
         # 绘制出售按钮
-        if self.game_manager.waiting_for_sell_decision:
+        if waiting == "sell":
             self.sell_buttons = self.renderer.draw_sell_buttons(
-                self.game_manager.properties_to_sell, 
+                [self.game_manager.board.get_tile(i).property for i in status["sell_options"]],
                 INFO_PANEL_X, 
                 510
             )
         else:
             self.sell_buttons = []
 
+        # AI速度（远程模式下AI由服务器执行）
+        if not self.remote:
+            self.renderer.draw_text(
+                f"AI速度 {self.ai_scheduler.label()}（按1/2/3切换）",
+                (50, WINDOW_HEIGHT - 30), GRAY, self.renderer.small_font
+            )
+            
         # 游戏结束提示
-        if self.game_manager.game_over:
+        if self.game_manager.game_over and self.game_manager.winner:
             text = f"游戏结束！{self.game_manager.winner.name} 获胜！"
             self.renderer.draw_text(text, (300, 350), RED, self.renderer.large_font)
             
@@ -215,6 +218,22 @@ class MonopolyGame:
 
 
 if __name__ == "__main__":
-    game = MonopolyGame()
-    game.run()
+    import argparse
+    parser = argparse.ArgumentParser(description="大富翁游戏")
+    parser.add_argument("--replay", help="回放录像文件")
+    parser.add_argument("--connect", help="连接游戏服务器（host:port 或 Unix套接字路径）")
+    parser.add_argument("--room", type=int, help="加入已有房间（默认新建房间）")
+    parser.add_argument("--estimate-workers", type=int, help="胜率估计的后台进程数（0为不显示胜率）")
+    args = parser.parse_args()
+    
+    if args.replay:
+        from ui.replay_viewer import ReplayViewer
+        ReplayViewer(args.replay).run()
+    elif args.connect:
+        from server.client import RemoteSession
+        game = MonopolyGame(RemoteSession(args.connect, args.room), args.estimate_workers)
+        game.run()
+    else:
+        game = MonopolyGame(estimate_workers=args.estimate_workers)
+        game.run()
 
@@ -2,63 +2,202 @@
 """地图管理器"""
 
 import math
+import os
 import random
+from functools import lru_cache
+import numpy as np
 from models.tile import Tile, TileType
 from models.property import Property
 from config import *
 
 
+# 地块类型在布局数组中的编码（与TileType定义顺序一致）
+TILE_TYPE_CODES = tuple(TileType)
+_CODE_START = TILE_TYPE_CODES.index(TileType.START)
+_RANDOM_TILE_CODES = np.array([
+    TILE_TYPE_CODES.index(TileType.PROPERTY),
+    TILE_TYPE_CODES.index(TileType.CHANCE),
+    TILE_TYPE_CODES.index(TileType.TAX),
+], dtype=np.uint8)
+_RANDOM_TILE_WEIGHTS = [0.7, 0.2, 0.1]
+_CODE_PROPERTY = int(_RANDOM_TILE_CODES[0])
+
+# 按地块总数缓存的圆形布局坐标，同尺寸地图的所有对局共享
+_POSITION_CACHE = {}
+
+
+def _cache_path(name):
+    return os.path.join(LAYOUT_CACHE_DIR, name)
+
+
+def _load_or_build(name, builder, use_disk):
+    """从磁盘缓存以内存映射方式加载数组，不存在时构建并原子写入"""
+    if not use_disk:
+        return builder()
+    path = _cache_path(name)
+    if os.path.exists(path):
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            pass  # 缓存损坏，重新生成
+    array = builder()
+    os.makedirs(LAYOUT_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+    return np.load(path, mmap_mode="r")
+
+
+def _build_positions(total_tiles):
+    """向量化计算圆形排列的地块坐标，返回形如(n, 2)的数组"""
+    radians = np.radians((360 / total_tiles) * np.arange(total_tiles))
+    positions = np.empty((total_tiles, 2), dtype=np.float64)
+    positions[:, 0] = BOARD_CENTER_X + np.cos(radians) * BOARD_RADIUS
+    positions[:, 1] = BOARD_CENTER_Y + np.sin(radians) * BOARD_RADIUS
+    return positions
+
+
+def _build_tile_types(total_tiles, seed):
+    """向量化地按权重随机生成地块类型编码"""
+    rng = np.random.default_rng(seed)
+    codes = rng.choice(_RANDOM_TILE_CODES, size=total_tiles, p=_RANDOM_TILE_WEIGHTS)
+    codes[0] = _CODE_START
+    return codes.astype(np.uint8)
+
+
+def get_positions(total_tiles):
+    """获取指定尺寸地图的地块坐标数组（进程内与磁盘双重缓存）"""
+    positions = _POSITION_CACHE.get(total_tiles)
+    if positions is None:
+        positions = _load_or_build(
+            f"positions_{total_tiles}.npy",
+            lambda: _build_positions(total_tiles),
+            total_tiles >= LAYOUT_CACHE_MIN_TILES
+        )
+        _POSITION_CACHE[total_tiles] = positions
+    return positions
+
+
+@lru_cache(maxsize=65536)
+def _tile_position(total_tiles, index):
+    # 共享坐标元组，避免每局重复保存浮点坐标
+    x, y = get_positions(total_tiles)[index]
+    return (float(x), float(y))
+
+
+@lru_cache(maxsize=65536)
+def _property_name(index):
+    return f"地产{index}"
+
+
+class TileList:
+    """
+    按需实例化的地块序列
+    地块类型与价格保存在紧凑数组中，Tile/Property对象只在首次访问时创建，
+    使百万级地块的地图不必为每个格子常驻对象
+    """
+
+    __slots__ = ("_board", "_tiles")
+
+    def __init__(self, board):
+        self._board = board
+        self._tiles = {}
+
+    def __len__(self):
+        return self._board.total_tiles
+
+    def __getitem__(self, index):
+        tile = self._tiles.get(index)
+        if tile is None:
+            if not -self._board.total_tiles <= index < self._board.total_tiles:
+                raise IndexError("tile index out of range")
+            index %= self._board.total_tiles
+            tile = self._tiles.get(index)
+            if tile is None:
+                tile = self._board._create_tile(index)
+                self._tiles[index] = tile
+        return tile
+
+    def __iter__(self):
+        for i in range(self._board.total_tiles):
+            yield self[i]
+
+    def peek(self, index):
+        """返回已实例化的地块，未实例化时返回None（不触发创建）"""
+        return self._tiles.get(index)
+
+    def materialized(self):
+        """已实例化的地块"""
+        return self._tiles.values()
+
+
 class BoardManager:
     """地图管理器"""
-    
-    def __init__(self, total_tiles):
+
+    def __init__(self, total_tiles, seed=None, tile_types=None):
         self.total_tiles = total_tiles
-        self.tiles = []
+        self.seed = seed
+        self.tile_types = tile_types  # 指定时直接使用（如重建已记录的对局）
+        # 大地图按比例放大每点骰子的步数，使绕行一圈的回合数与默认地图相当
+        self.move_scale = max(1, total_tiles // TOTAL_TILES)
+        # 相邻地块的弧长间距与绘制尺寸（世界坐标），地块过密时缩小以免重叠
+        self.tile_spacing = 2 * math.pi * BOARD_RADIUS / total_tiles
+        self.tile_size = min(TILE_SIZE, self.tile_spacing * 0.8)
+        self.tiles = TileList(self)
         self._generate_board()
-        
+
     def _generate_board(self):
         """生成地图"""
-        # 定义地块类型及其权重
-        tile_type_options = [TileType.PROPERTY, TileType.CHANCE, TileType.TAX]
-        weights = [0.7, 0.2, 0.1]
-
-        for i in range(self.total_tiles):
-            # 计算地块位置（圆形排列）
-            angle = (360 / self.total_tiles) * i
-            radian = math.radians(angle)
-            x = BOARD_CENTER_X + math.cos(radian) * BOARD_RADIUS
-            y = BOARD_CENTER_Y + math.sin(radian) * BOARD_RADIUS
-            
-            # 确定地块类型
-            if i == 0:
-                tile_type = TileType.START
-            else:
-                # 根据权重随机选择地块类型
-                tile_type = random.choices(tile_type_options, weights, k=1)[0]
-                
-            tile = Tile(i, tile_type, (x, y))
-            
-            # 如果是地产，创建地产对象
-            if tile_type == TileType.PROPERTY:
-                base_price = 500 + i * 100
-                property_obj = Property(
-                    f"地产{i}",
-                    base_price,
-                    0.1,  # 初始租金率10%
-                    i
-                )
-                tile.property = property_obj
-                
-            self.tiles.append(tile)
-            
+        self.positions = get_positions(self.total_tiles)
+
+        # 指定种子的大地图按(尺寸, 种子)缓存到磁盘；未指定种子时由全局random派生
+        if self.tile_types is None:
+            seed = self.seed if self.seed is not None else random.getrandbits(64)
+            self.tile_types = _load_or_build(
+                f"tiles_{self.total_tiles}_{self.seed}.npy",
+                lambda: _build_tile_types(self.total_tiles, seed),
+                self.seed is not None and self.total_tiles >= LAYOUT_CACHE_MIN_TILES
+            )
+
+        # 未被改动过的地产价值总和，用于在不实例化地块的情况下统计总财富
+        property_indices = np.flatnonzero(self.tile_types == _CODE_PROPERTY)
+        self.base_property_value = int(self._base_price(property_indices).sum())
+
+    def _base_price(self, index):
+        # 价格随地块在一圈中的相对位置递增，大地图保持与默认地图相同的价格区间
+        return 500 + index * 100 * TOTAL_TILES // self.total_tiles
+
+    def _create_tile(self, index):
+        """实例化单个地块"""
+        tile_type = TILE_TYPE_CODES[self.tile_types[index]]
+        tile = Tile(index, tile_type, _tile_position(self.total_tiles, index))
+
+        # 如果是地产，创建地产对象
+        if tile_type == TileType.PROPERTY:
+            tile.property = Property(
+                _property_name(index),
+                self._base_price(index),
+                0.1,  # 初始租金率10%
+                index
+            )
+        return tile
+
     def get_tile(self, index):
         """获取指定索引的地块"""
         return self.tiles[index]
-        
+
+    def get_total_property_value(self):
+        """计算地图上所有地产的价值之和"""
+        total = self.base_property_value
+        for tile in self.tiles.materialized():
+            if tile.property:
+                total += tile.property.property_price - tile.property.base_price
+        return total
+
     def get_player_position(self, tile_index, is_ai=False):
         """获取玩家在地块上的显示位置"""
-        tile = self.tiles[tile_index]
-        x, y = tile.position
+        x, y = _tile_position(self.total_tiles, tile_index)
         # 移除偏移，使玩家居中
 
         # ai向右偏移15
@@ -68,4 +207,3 @@ class BoardManager:
         else:
             x -= 15
         return (x, y)
-
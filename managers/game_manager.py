@@ -1,34 +1,93 @@
 # -*- coding: utf-8 -*-
 """游戏管理器 - 核心游戏逻辑"""
 
+import colorsys
 import random
 from models.player import Player
 from managers.board_manager import BoardManager
-from ai.ai_player import AIPlayer
+from managers import zobrist
+from ai.ai_player import DEFAULT_STRATEGY
 from config import *
 
 
+def build_player_specs(human_count=NUM_HUMAN_PLAYERS, ai_count=NUM_AI_PLAYERS):
+    """
+    生成玩家配置列表 [(名称, 是否AI), ...]，只有一名时沿用"玩家"/"AI"的名称
+    配置项可带第三个元素指定AI策略：(名称, 是否AI, 策略)
+    """
+    humans = [("玩家" if human_count == 1 else f"玩家{i + 1}", False) for i in range(human_count)]
+    ais = [("AI" if ai_count == 1 else f"AI{i + 1}", True) for i in range(ai_count)]
+    return humans + ais
+
+
+def player_color(seat, count):
+    """按座位分配玩家颜色，前两个座位沿用蓝/红"""
+    if seat == 0:
+        return BLUE
+    if seat == 1:
+        return RED
+    r, g, b = colorsys.hsv_to_rgb(seat / count, 0.6, 1.0)
+    return (int(r * 255), int(g * 255), int(b * 255))
+
+
 class GameManager:
     """游戏管理器"""
     
-    def __init__(self):
+    def __init__(self, total_tiles=TOTAL_TILES, seed=None, player_specs=None, board_seed=None, tile_types=None):
+        # 每局独立的随机数生成器，指定种子时整局可复现
+        self.seed = seed
+        self.reseed(seed)
+        
         # 初始化玩家
-        self.human_player = Player("玩家", START_CASH, is_ai=False, color=BLUE)
-        self.ai_player = Player("AI", START_CASH, is_ai=True, color=RED)
-        self.players = [self.human_player, self.ai_player]
+        if player_specs is None:
+            player_specs = build_player_specs()
+        if not MIN_PLAYERS <= len(player_specs) <= MAX_PLAYERS:
+            raise ValueError(f"玩家数须在{MIN_PLAYERS}到{MAX_PLAYERS}之间")
+        self.players = []
+        for seat, spec in enumerate(player_specs):
+            name, is_ai = spec[0], spec[1]
+            player = Player(name, START_CASH, is_ai=is_ai, color=player_color(seat, len(player_specs)))
+            player.seat = seat
+            if len(spec) > 2:
+                player.strategy = spec[2]
+            self.players.append(player)
         self.current_player_index = 0
         
-        # 初始化地图
-        self.board = BoardManager(TOTAL_TILES)
+        # 存活玩家组成的环形双向链表，破产时O(1)移出轮转
+        self.next_seat = [(i + 1) % len(self.players) for i in range(len(self.players))]
+        self.prev_seat = [(i - 1) % len(self.players) for i in range(len(self.players))]
+        self.alive_count = len(self.players)
+        
+        # 初始化地图（指定tile_types时直接使用，不生成也不缓存布局）
+        self.board = BoardManager(total_tiles, seed if board_seed is None else board_seed, tile_types)
         
         # CPI 管理
         self.cpi = INITIAL_CPI
-        self.last_total_wealth = START_CASH*2
+        self.last_total_wealth = START_CASH*len(self.players)
         
         # 游戏状态
+        self.turn_count = 0
+        self.event_listeners = []
         self.game_over = False
         self.winner = None
+        self.adjudicated = False    # 是否由判定提前结束（而非只剩一名玩家）
         self.messages = ["点击'投掷骰子'开始游戏"]
+        self.message_count = len(self.messages)   # 累计消息数（不受保留条数限制）
+        self.dirty_tiles = set()                  # 自上次状态同步以来地产有变化的地块
+        # 局面哈希（默认关闭，由搜索AI启用）：地产部分增量维护，以及各地块当前贡献的键
+        self.hashing = False
+        self.board_hash = zobrist.board_key(seed, total_tiles)
+        self.tile_hashes = {}
+        self.reset_turn_state()
+        
+    def in_turn_state(self):
+        """是否有回合内的临时状态（等待决策、待付款、缓存的事件结果），快照与检查点不包含这些状态"""
+        return (self.waiting_for_buy_decision or self.waiting_for_sell_decision
+                or self.waiting_for_upgrade_decision or self.pending_followup_action is not None
+                or self.post_payment_action is not None or self.cached_process_result is not None)
+
+    def reset_turn_state(self):
+        """清除回合内的临时状态（整体恢复状态后调用）"""
         self.waiting_for_buy_decision = False
         self.waiting_for_sell_decision = False
         self.waiting_for_upgrade_decision = False
@@ -41,17 +100,75 @@ class GameManager:
         self.post_payment_action = None
         self.cached_process_result = None
         self.current_property = None
+
+    def reseed(self, seed):
+        """
+        设定随机数生成器：骰子与事件使用rng，AI决策使用独立的decision_rng，
+        决策不同不会改变之后的骰子与事件（以公共随机数比较策略时方差更小）
+        """
+        self.rng = random.Random(seed)
+        self.decision_rng = random.Random(self.rng.getrandbits(64))
+
+    def add_listener(self, callback):
+        """注册事件监听器 callback(game, event_type, data)"""
+        self.event_listeners.append(callback)
+
+    def _emit(self, event_type, **data):
+        for callback in self.event_listeners:
+            callback(self, event_type, data)
         
     def add_message(self, new_message):
         """添加新消息并保留最近10条"""
         self.messages.append(new_message)
+        self.message_count += 1
         if len(self.messages) > 10:
             self.messages.pop(0)
         
+    def property_changed(self, prop):
+        """地产的所有者、等级或价格变化后调用：记入待同步集合并更新局面哈希"""
+        self.dirty_tiles.add(prop.tile_index)
+        if self.hashing:
+            self.rehash_property(prop)
+
+    def enable_hashing(self):
+        """启用局面哈希（每次地产变化多一次哈希更新，普通对局不需要）"""
+        self.hashing = True
+        self.rehash_board()
+
+    def rehash_property(self, prop):
+        """增量更新局面哈希中该地产的部分"""
+        if not self.hashing:
+            return
+        new = zobrist.property_key(prop)
+        old = self.tile_hashes.pop(prop.tile_index, 0)
+        if new:
+            self.tile_hashes[prop.tile_index] = new
+        self.board_hash ^= old ^ new
+
+    def rehash_board(self):
+        """从头计算局面哈希的地产部分（整体恢复状态后调用）"""
+        if not self.hashing:
+            return
+        self.board_hash = zobrist.board_key(self.seed, self.board.total_tiles)
+        self.tile_hashes = {}
+        for tile in self.board.tiles.materialized():
+            if tile.property is not None:
+                self.rehash_property(tile.property)
+
+    def state_hash(self):
+        """局面哈希：地产部分增量维护，玩家与全局部分现算（须先enable_hashing）"""
+        if not self.hashing:
+            raise RuntimeError("局面哈希未启用")
+        return self.board_hash ^ zobrist.dynamic_key(self)
+
     def get_current_player(self):
         """获取当前玩家"""
         return self.players[self.current_player_index]
         
+    def get_strategy(self, player):
+        """获取玩家的AI策略"""
+        return player.strategy or DEFAULT_STRATEGY
+        
     def _clamp(self, value, min_value, max_value):
         return max(min_value, min(value, max_value))
         
@@ -61,11 +178,7 @@ class GameManager:
     def get_total_game_wealth(self):
         """计算游戏总财富"""
         total = sum(player.cash for player in self.players)
-        total += sum(
-            prop.property_price 
-            for tile in self.board.tiles 
-            for prop in ([tile.property] if tile.property else [])
-        )
+        total += self.board.get_total_property_value()
         return total
     
     def update_cpi(self):
@@ -145,8 +258,8 @@ class GameManager:
         
     def adjust_rates(self, player):
         """每次经过起点后令利率和税率浮动"""
-        interest_delta = random.uniform(-INTEREST_RATE_FLUCTUATION, INTEREST_RATE_FLUCTUATION)
-        tax_delta = random.uniform(-TAX_RATE_FLUCTUATION, TAX_RATE_FLUCTUATION)
+        interest_delta = self.rng.uniform(-INTEREST_RATE_FLUCTUATION, INTEREST_RATE_FLUCTUATION)
+        tax_delta = self.rng.uniform(-TAX_RATE_FLUCTUATION, TAX_RATE_FLUCTUATION)
         
         player.interest_rate = self._clamp(
             player.interest_rate + interest_delta,
@@ -163,17 +276,18 @@ class GameManager:
             f"-> 新利率 {self._format_percentage(player.interest_rate)}，新土地税率 {self._format_percentage(player.tax_rate)}"
         )
         
-    def roll_dice(self):
-        """投掷骰子"""
+    def roll_dice(self, dice=None):
+        """投掷骰子（dice指定点数，供搜索枚举骰子时使用）"""
         if self.game_over or self.waiting_for_buy_decision:
             return None
             
         player = self.get_current_player()
-        dice = random.randint(1, 6)
+        if dice is None:
+            dice = self.rng.randint(1, 6)
         self.add_message(f"{player.name} 投掷骰子: {dice}")
         
-        # 移动玩家
-        passed_start = player.move(dice, TOTAL_TILES)
+        # 移动玩家（大地图按比例放大步数）
+        passed_start = player.move(dice * self.board.move_scale, self.board.total_tiles)
         
         # 经过起点结算
         if passed_start:
@@ -219,7 +333,7 @@ class GameManager:
             # 无主地产
             if player.is_ai:
                 # AI自动决策
-                if AIPlayer.decide_buy_property(player, prop):
+                if self.get_strategy(player).decide_buy_property(player, prop, self.decision_rng):
                     self.buy_property(player, prop)
                     self.add_message(f"{player.name} 购买了 {prop.name} (${prop.base_price})")
                 else:
@@ -238,6 +352,7 @@ class GameManager:
         elif prop.owner != player:
             # 对方地产，支付租金
             rent = prop.get_rent(self.cpi)
+            self.property_changed(prop)
             owner = prop.owner
             if not player.can_afford(rent):
                 result = self.enter_sell_mode(player, rent, owner, payment_type="rent", followup="end_turn")
@@ -261,8 +376,9 @@ class GameManager:
                     
                     if player.is_ai:
                         # AI自动升级
-                        if random.random() > 0.3:  # AI 70%概率升级
+                        if self.get_strategy(player).decide_upgrade(player, prop, upgrade_cost, self.decision_rng):
                             prop.upgrade()
+                            self.property_changed(prop)
                             player.deduct_cash(upgrade_cost)
                             self.add_message(f"-> {player.name} 升级了 {prop.name}！")
                     else:
@@ -287,28 +403,28 @@ class GameManager:
             
     def _handle_chance(self, player):
         """处理机会事件"""
-        event_type = random.randint(0, 3)  # 增加到4种事件类型以包含CPI事件
+        event_type = self.rng.randint(0, 3)  # 增加到4种事件类型以包含CPI事件
         
         if event_type == 0:
             # 获得奖金
-            bonus = random.randint(100, 500)
+            bonus = self.rng.randint(100, 500)
             player.add_cash(bonus)
             self.add_message(f"{player.name} 获得奖金 ${bonus}")
         elif event_type == 1:
             # 支付罚款
-            penalty = random.randint(100, 300)
+            penalty = self.rng.randint(100, 300)
             player.deduct_cash(penalty)
             self.add_message(f"{player.name} 支付罚款 ${penalty}")
         elif event_type == 2:
             # 位置移动
-            move_steps = random.choice([i for i in range(-6, 7) if i != 0])
+            move_steps = self.rng.choice([i for i in range(-6, 7) if i != 0])
             if move_steps != 0:
-                player.move(move_steps, TOTAL_TILES)
+                player.move(move_steps * self.board.move_scale, self.board.total_tiles)
                 self.add_message(f"{player.name} 移动 {move_steps} 格")
                 self.process_tile_event()
         else:
             # 物价指数浮动
-            delta = random.uniform(CHANCE_CPI_FLUCTUATION[0], CHANCE_CPI_FLUCTUATION[1])
+            delta = self.rng.uniform(CHANCE_CPI_FLUCTUATION[0], CHANCE_CPI_FLUCTUATION[1])
             direction = "上升" if delta > 0 else "下降"
             self.add_message(f"{player.name} 触发突发事件：物价指数{direction}！")
             self.apply_cpi_fluctuation(delta)
@@ -327,6 +443,7 @@ class GameManager:
         if player.can_afford(prop.base_price):
             player.deduct_cash(prop.base_price)
             prop.transfer_ownership(player)
+            self.property_changed(prop)
             return True
         return False
         
@@ -335,7 +452,7 @@ class GameManager:
         if not self.waiting_for_buy_decision:
             return
             
-        player = self.human_player
+        player = self.get_current_player()
         prop = self.current_property
         
         if buy and self.buy_property(player, prop):
@@ -351,13 +468,14 @@ class GameManager:
         if not self.waiting_for_upgrade_decision:
             return
         
-        player = self.human_player
+        player = self.get_current_player()
         prop = self.upgrade_property
         
         if upgrade:
             upgrade_cost = prop.get_upgrade_cost(self.cpi)
             if player.can_afford(upgrade_cost):
                 prop.upgrade()
+                self.property_changed(prop)
                 player.deduct_cash(upgrade_cost)
                 self.add_message(f"升级成功！{prop.name} 现在是 Lv{prop.level}")
             else:
@@ -368,33 +486,69 @@ class GameManager:
         self.waiting_for_upgrade_decision = False
         self.upgrade_property = None
 
-    def check_game_over(self):
-        """检查游戏是否结束"""
-        if self.human_player.get_total_wealth() <= 0:
-            self.game_over = True
-            self.winner = self.ai_player
-            self.add_message("游戏结束！AI 获胜！")
-            return True
-            
-        if self.ai_player.get_total_wealth() <= 0:
+    def play_ai_turn(self, dice=None):
+        """无界面模式下由AI完成当前玩家的整个回合，返回本回合的事件处理结果"""
+        self.roll_dice(dice)
+        result = self.process_tile_event()
+        self.next_turn()
+        return result
+
+    def eliminate_player(self, player):
+        """玩家破产出局：收回其地产并从轮转中移除"""
+        if not player.alive:
+            return
+        for prop in list(player.properties):
+            prop.make_unowned()
+            self.property_changed(prop)
+        player.alive = False
+        # 从环形链表摘除；出局者保留自己的next指针，使其回合结束后仍能找到下一位
+        prev_seat = self.prev_seat[player.seat]
+        next_seat = self.next_seat[player.seat]
+        self.next_seat[prev_seat] = next_seat
+        self.prev_seat[next_seat] = prev_seat
+        self.alive_count -= 1
+        self.add_message(f"{player.name} 破产出局！剩余 {self.alive_count} 名玩家")
+        
+        if self.alive_count == 1:
             self.game_over = True
-            self.winner = self.human_player
-            self.add_message("游戏结束！玩家 获胜！")
+            self.winner = self.players[next_seat]
+            self.add_message(f"游戏结束！{self.winner.name} 获胜！")
+            self._emit("game_over", winner=self.winner.seat)
+
+    def adjudicate(self, winner):
+        """提前判定胜负并结束对局（用于批量模拟中胜负已无悬念的对局）"""
+        self.game_over = True
+        self.adjudicated = True
+        self.winner = winner
+        self.add_message(f"游戏结束！判定 {winner.name} 获胜")
+        self._emit("game_over", winner=winner.seat)
+
+    def check_game_over(self):
+        """检查游戏是否结束（只检查本回合行动的玩家，其余玩家财富在其回合内不会归零）"""
+        if self.game_over:
             return True
-            
-        return False
+        player = self.get_current_player()
+        if player.alive and player.get_total_wealth() <= 0:
+            self.eliminate_player(player)
+        return self.game_over
         
     def next_turn(self):
         """下一回合"""
+        # 回合内的临时结果不带入下一回合（AI卖地付租后handle_post_payment缓存的结果无人取走）
+        self.cached_process_result = None
+        self.post_payment_action = None
+        self.turn_count += 1
+        self._emit("turn_end", turn=self.turn_count, seat=self.current_player_index)
         if self.check_game_over():
             return
             
-        self.current_player_index = (self.current_player_index + 1) % 2
+        self.current_player_index = self.next_seat[self.current_player_index]
         player = self.get_current_player()
         self.add_message(f"轮到 {player.name} 行动")
         
         # 更新CPI
         self.update_cpi()
+        self._emit("cpi_update", cpi=self.cpi, wealth=self.last_total_wealth)
 
     def enter_sell_mode(self, player, amount, owner, payment_type="rent", followup="end_turn"):
         """进入出售地产模式"""
@@ -410,6 +564,10 @@ class GameManager:
             if result == "paid":
                 return self.handle_post_payment()
             return "end_turn"
+        elif not player.properties:
+            # 没有可出售的地产，直接破产出局
+            self.resolve_pending_payment()
+            return "end_turn"
         else:
             self.waiting_for_sell_decision = True
             label = "租金" if payment_type == "rent" else "土地税"
@@ -417,10 +575,11 @@ class GameManager:
             return "wait"
     
     def _perform_property_sale(self, player, prop):
-        price = prop.property_price 
-        player.add_cash(prop.property_price)
+        price = prop.property_price
+        player.add_cash(price)
         prop.make_unowned()
-        self.add_message(f"{player.name} 出售了 {prop.name}，获得 ${property_price}")
+        self.property_changed(prop)
+        self.add_message(f"{player.name} 出售了 {prop.name}，获得 ${price}")
     
     def sell_property(self, player, tile_index):
         """出售指定的地产"""
@@ -434,7 +593,7 @@ class GameManager:
     
     def _auto_sell_properties(self, player):
         while not player.can_afford(self.pending_payment_amount) and player.properties:
-            prop_to_sell = AIPlayer.choose_property_to_sell(player)
+            prop_to_sell = self.get_strategy(player).choose_property_to_sell(player)
             if not prop_to_sell:
                 break
             self._perform_property_sale(player, prop_to_sell)
@@ -477,9 +636,7 @@ class GameManager:
             self.pending_payment_receiver = None
             self.pending_payment_type = None
             self.pending_followup_action = None
-            self.game_over = True
-            self.winner = self.ai_player if player == self.human_player else self.human_player
-            self.add_message("游戏结束！" + (self.winner.name if self.winner else "对手") + " 获胜！")
+            self.eliminate_player(player)
             return "bankrupt"
         
         # 仍需继续出售
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""回合操作会话 - 人类玩家操作与AI自动行动的回合状态机
+
+本地客户端与游戏服务器共用同一套规则：客户端把按钮映射为动作，
+服务器把网络消息映射为动作。
+"""
+
+# 人类玩家可执行的动作
+ACTIONS = ("roll", "buy", "skip", "upgrade", "skip_upgrade", "sell", "end_turn")
+
+
+class GameSession:
+    """回合操作会话"""
+
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self.action_taken = False   # 本回合是否已完成行动（可以结束回合）
+
+    def is_human_turn(self):
+        """当前是否轮到人类玩家"""
+        gm = self.game_manager
+        return not gm.game_over and not gm.get_current_player().is_ai
+
+    def legal_actions(self):
+        """当前可执行的动作"""
+        gm = self.game_manager
+        if not self.is_human_turn():
+            return []
+        if gm.waiting_for_upgrade_decision:
+            return ["upgrade", "skip_upgrade"]
+        if gm.waiting_for_sell_decision:
+            return ["sell"]
+        if gm.waiting_for_buy_decision:
+            return ["buy", "skip"]
+        if self.action_taken:
+            return ["end_turn"]
+        return ["roll"]
+
+    def apply(self, action, tile_index=None):
+        """
+        执行人类玩家的动作，返回是否执行成功（不合法的动作不改变状态）
+        出售动作需要tile_index指定出售的地块
+        """
+        if action not in self.legal_actions():
+            return False
+        gm = self.game_manager
+
+        if action in ("upgrade", "skip_upgrade"):
+            gm.player_upgrade_decision(action == "upgrade")
+            self.action_taken = True
+
+        elif action == "sell":
+            player = gm.get_current_player()
+            result = gm.sell_property(player, tile_index)
+            if result is None:
+                return False
+            if result == "paid":
+                followup = gm.handle_post_payment()
+                if followup == "end_turn":
+                    self.action_taken = True
+                # followup为wait时等待新的事件处理，例如购买决策
+            elif result == "bankrupt":
+                self.action_taken = True
+
+        elif action == "roll":
+            gm.roll_dice()
+            result = gm.process_tile_event()
+            if result == "end_turn":
+                self.action_taken = True
+            # result为wait时等待玩家决策
+
+        elif action in ("buy", "skip"):
+            gm.player_buy_decision(action == "buy")
+            self.action_taken = True
+
+        elif action == "end_turn":
+            gm.next_turn()
+            self.action_taken = False
+
+        return True
+
+    def ai_can_act(self):
+        """当前是否由AI行动"""
+        gm = self.game_manager
+        if gm.game_over:
+            return False
+        return (gm.get_current_player().is_ai
+                and not gm.waiting_for_buy_decision
+                and not gm.waiting_for_sell_decision)
+
+    def step_ai(self):
+        """AI执行一步：投骰并处理地块，回合结束时切换到下一位玩家"""
+        if not self.ai_can_act():
+            return False
+        gm = self.game_manager
+        if not self.action_taken:
+            gm.roll_dice()
+            result = gm.process_tile_event()
+            if result == "end_turn":
+                self.action_taken = False
+                gm.next_turn()
+            else:
+                self.action_taken = True
+        else:
+            self.action_taken = False
+            gm.next_turn()
+        return True
+
+    def status(self):
+        """回合内的临时状态（快照之外、客户端绘制按钮所需的信息）"""
+        gm = self.game_manager
+        waiting = None
+        if gm.waiting_for_upgrade_decision:
+            waiting = "upgrade"
+        elif gm.waiting_for_sell_decision:
+            waiting = "sell"
+        elif gm.waiting_for_buy_decision:
+            waiting = "buy"
+        return {
+            "action_taken": self.action_taken,
+            "waiting": waiting,
+            "sell_options": [prop.tile_index for prop in gm.properties_to_sell],
+        }
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""游戏状态快照与差量
+
+快照是只含基本类型的字典，可直接序列化为JSON；
+差量只记录两个快照之间发生变化的玩家、地产与全局字段。
+快照应在回合之间生成（不含等待决策、待付款等回合内的临时状态）。
+"""
+
+import base64
+import numpy as np
+from managers.game_manager import GameManager
+
+
+def describe_game(game):
+    """对局的静态信息（玩家与地图），用于在别处重建同样的GameManager"""
+    return {
+        "seed": game.seed,
+        "total_tiles": game.board.total_tiles,
+        "tile_types": base64.b64encode(np.ascontiguousarray(game.board.tile_types).tobytes()).decode("ascii"),
+        "players": [[p.name, p.is_ai] for p in game.players],
+    }
+
+
+def build_game(description):
+    """根据describe_game的结果重建对局（地块类型与原局完全一致）"""
+    specs = [tuple(spec) for spec in description["players"]]
+    tile_types = np.frombuffer(base64.b64decode(description["tile_types"]), dtype=np.uint8)
+    return GameManager(description["total_tiles"], description["seed"], specs, tile_types=tile_types)
+
+
+def snapshot(game):
+    """生成完整状态快照"""
+    properties = {}
+    for tile in game.board.tiles.materialized():
+        prop = tile.property
+        if prop is None:
+            continue
+        if prop.owner is not None or prop.level or prop.property_price != prop.base_price:
+            properties[str(tile.index)] = [
+                prop.owner.seat if prop.owner else -1, prop.level, prop.property_price
+            ]
+    return {
+        "turn": game.turn_count,
+        "current": game.current_player_index,
+        "cpi": game.cpi,
+        "game_over": game.game_over,
+        "winner": game.winner.seat if game.winner else -1,
+        "players": [
+            [p.cash, p.position, p.interest_rate, p.tax_rate, p.alive,
+             [prop.tile_index for prop in p.properties]]
+            for p in game.players
+        ],
+        "properties": properties,
+        "messages": list(game.messages),
+    }
+
+
+def diff(old, new):
+    """计算从old到new的差量"""
+    delta = {}
+    for key in ("turn", "current", "cpi", "game_over", "winner"):
+        if old[key] != new[key]:
+            delta[key] = new[key]
+    players = {
+        str(seat): values
+        for seat, (values, old_values) in enumerate(zip(new["players"], old["players"]))
+        if values != old_values
+    }
+    if players:
+        delta["players"] = players
+    properties = {
+        index: values for index, values in new["properties"].items()
+        if old["properties"].get(index) != values
+    }
+    removed = [index for index in old["properties"] if index not in new["properties"]]
+    if properties:
+        delta["properties"] = properties
+    if removed:
+        delta["removed"] = removed
+    if new["messages"] != old["messages"]:
+        # 消息是滑动窗口，只记录移出的条数与新追加的消息
+        old_messages, new_messages = old["messages"], new["messages"]
+        for dropped in range(len(old_messages) + 1):
+            kept = old_messages[dropped:]
+            if new_messages[:len(kept)] == kept:
+                delta["messages"] = [dropped, new_messages[len(kept):]]
+                break
+    return delta
+
+
+def apply_delta(state, delta):
+    """在快照上应用差量，返回新的快照（不修改原快照）"""
+    new = dict(state)
+    for key in ("turn", "current", "cpi", "game_over", "winner"):
+        if key in delta:
+            new[key] = delta[key]
+    if "messages" in delta:
+        dropped, added = delta["messages"]
+        new["messages"] = state["messages"][dropped:] + added
+    if "players" in delta:
+        new["players"] = list(state["players"])
+        for seat, values in delta["players"].items():
+            new["players"][int(seat)] = values
+    if "properties" in delta or "removed" in delta:
+        new["properties"] = dict(state["properties"])
+        new["properties"].update(delta.get("properties", {}))
+        for index in delta.get("removed", ()):
+            new["properties"].pop(index, None)
+    return new
+
+
+def restore(game, state):
+    """把快照写回GameManager（玩家、地产与全局状态）"""
+    game.turn_count = state["turn"]
+    game.current_player_index = state["current"]
+    game.cpi = state["cpi"]
+    game.game_over = state["game_over"]
+    game.winner = game.players[state["winner"]] if state["winner"] >= 0 else None
+    game.messages = list(state["messages"])
+
+    for player, values in zip(game.players, state["players"]):
+        player.cash, player.position, player.interest_rate, player.tax_rate, player.alive = values[:5]
+    rebuild_rotation(game)
+
+    # 先把已实例化的地产恢复为初始状态，再应用快照中的地产
+    for tile in game.board.tiles.materialized():
+        prop = tile.property
+        if prop is not None:
+            prop.owner = None
+            prop.level = 0
+            prop.property_price = prop.base_price
+    for index, (owner, level, price) in state["properties"].items():
+        prop = game.board.get_tile(int(index)).property
+        prop.level = level
+        prop.property_price = price
+        if owner >= 0:
+            prop.owner = game.players[owner]
+    # 按原顺序恢复持有列表（出售时的选择依赖该顺序）
+    for player, values in zip(game.players, state["players"]):
+        player.properties = [game.board.get_tile(index).property for index in values[5]]
+    game.rehash_board()
+
+
+def rebuild_rotation(game):
+    """按玩家存活状态重建轮转链表"""
+    alive = [p.seat for p in game.players if p.alive]
+    game.alive_count = len(alive)
+    for i, seat in enumerate(alive):
+        game.next_seat[seat] = alive[(i + 1) % len(alive)]
+        game.prev_seat[seat] = alive[i - 1]
+    # 出局玩家指向其后第一位存活玩家
+    for player in game.players:
+        if not player.alive and alive:
+            seat = player.seat
+            game.next_seat[seat] = min(alive, key=lambda s: (s - seat) % len(game.players))
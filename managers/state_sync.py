@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""增量状态同步 - 服务器只下发上次同步以来变化的字段
+
+每次同步生成一个带版本号的差量：
+    {"v": 版本号, "turn": ..., "current": ..., "cpi": ...,      # 仅变化的全局字段
+     "players": {"座位": [现金, 位置, 利率, 税率, 存活, [地块索引]]},
+     "properties": {"地块索引": [拥有者座位(-1为无), 等级, 价格]},
+     "messages": [新追加的消息]}
+地产变化来自GameManager.dirty_tiles，不需要遍历地图，开销与变化量成正比。
+客户端发现版本不连续时应重新请求完整快照。
+"""
+
+from managers import game_state
+
+GLOBAL_FIELDS = ("turn", "current", "cpi", "game_over", "winner")
+
+
+def _player_row(player):
+    return [player.cash, player.position, player.interest_rate, player.tax_rate, player.alive,
+            [prop.tile_index for prop in player.properties]]
+
+
+def _globals(game):
+    return (game.turn_count, game.current_player_index, game.cpi, game.game_over,
+            game.winner.seat if game.winner else -1)
+
+
+class StateSync:
+    """服务器端的状态同步器（每局一个）"""
+
+    def __init__(self, game):
+        self.game = game
+        self.version = 0
+        game.dirty_tiles.clear()
+        self._globals = _globals(game)
+        self._players = [_player_row(p) for p in game.players]
+        self._message_count = game.message_count
+
+    def full_snapshot(self):
+        """
+        完整快照及其版本号（加入房间或重新同步时使用）
+        调用前应先collect并下发未同步的变化，否则快照会领先于版本号
+        """
+        return {"v": self.version, "state": game_state.snapshot(self.game)}
+
+    def collect(self):
+        """收集上次同步以来的变化，返回差量；没有变化时返回None"""
+        game = self.game
+        delta = {}
+
+        values = _globals(game)
+        if values != self._globals:
+            for key, old, new in zip(GLOBAL_FIELDS, self._globals, values):
+                if old != new:
+                    delta[key] = new
+            self._globals = values
+
+        players = {}
+        for player in game.players:
+            row = _player_row(player)
+            if row != self._players[player.seat]:
+                players[str(player.seat)] = row
+                self._players[player.seat] = row
+        if players:
+            delta["players"] = players
+
+        if game.dirty_tiles:
+            properties = {}
+            for index in game.dirty_tiles:
+                prop = game.board.get_tile(index).property
+                properties[str(index)] = [
+                    prop.owner.seat if prop.owner else -1, prop.level, prop.property_price
+                ]
+            game.dirty_tiles.clear()
+            delta["properties"] = properties
+
+        added = game.message_count - self._message_count
+        if added:
+            delta["messages"] = game.messages[-added:] if added < len(game.messages) else list(game.messages)
+            self._message_count = game.message_count
+
+        if not delta:
+            return None
+        self.version += 1
+        delta["v"] = self.version
+        return delta
+
+
+def apply_changes(game, delta):
+    """在客户端的镜像GameManager上应用差量"""
+    for key in GLOBAL_FIELDS:
+        if key not in delta:
+            continue
+        value = delta[key]
+        if key == "turn":
+            game.turn_count = value
+        elif key == "current":
+            game.current_player_index = value
+        elif key == "cpi":
+            game.cpi = value
+        elif key == "game_over":
+            game.game_over = value
+        else:
+            game.winner = game.players[value] if value >= 0 else None
+
+    for index, (owner, level, price) in delta.get("properties", {}).items():
+        prop = game.board.get_tile(int(index)).property
+        prop.owner = game.players[owner] if owner >= 0 else None
+        prop.level = level
+        prop.property_price = price
+        game.rehash_property(prop)
+
+    rotation_changed = False
+    for seat, values in delta.get("players", {}).items():
+        player = game.players[int(seat)]
+        rotation_changed |= player.alive != values[4]
+        player.cash, player.position, player.interest_rate, player.tax_rate, player.alive = values[:5]
+        player.properties = [game.board.get_tile(index).property for index in values[5]]
+    if rotation_changed:
+        game_state.rebuild_rotation(game)
+
+    for message in delta.get("messages", ()):
+        game.add_message(message)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""局面哈希（Zobrist式）
+
+局面哈希是各组成部分的键按位异或：
+- 地产部分：每块有主或已升级的地块贡献 键(地块, 所有者座位, 等级)，
+  由GameManager在所有者或等级变化时增量维护，开销与地图大小无关；
+  只有调用enable_hashing的对局（如搜索AI的副本对局）才维护，普通对局没有这部分开销
+- 玩家部分：位置、分档后的现金、利率与税率、是否存活
+- 全局部分：当前玩家、分档后的CPI
+玩家与全局部分只有O(玩家数)，取哈希时现算。现金、CPI、利率分档后相近的局面视为相同，
+供搜索或推演缓存局面评估（见ai.transposition）。
+
+地图可能有上百万块地块，键不预先生成随机数表，而是由坐标经splitmix64混合得到。
+"""
+
+CASH_BUCKET = 1000       # 现金分档（元）
+CPI_BUCKET = 0.01        # CPI分档
+RATE_BUCKET = 0.001      # 利率、税率分档
+
+_MASK = (1 << 64) - 1
+
+# 各类键的区分常数
+_PROPERTY = 1
+_PLAYER = 2
+_CURRENT = 3
+_CPI = 4
+_BOARD = 5
+
+
+def _mix(x):
+    """splitmix64"""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def key(*values):
+    """由若干非负整数得到64位键"""
+    h = 0
+    for value in values:
+        h = _mix(h ^ value)
+    return h
+
+
+def _bucket(value, size):
+    # 负数映射到奇数、非负数映射到偶数，保证key的输入非负
+    n = int(value // size)
+    return 2 * n if n >= 0 else -2 * n - 1
+
+
+def board_key(seed, total_tiles):
+    """地图本身的键（同一种子与地块数的地图相同）"""
+    return key(_BOARD, seed if seed is not None else 0, total_tiles)
+
+
+def property_key(prop):
+    """一块地产的键；无主且未升级的地产为0（不参与异或）"""
+    if prop.owner is None and prop.level == 0:
+        return 0
+    owner = prop.owner.seat + 1 if prop.owner is not None else 0
+    return key(_PROPERTY, prop.tile_index, owner, prop.level)
+
+
+def dynamic_key(game):
+    """玩家与全局部分的键"""
+    h = key(_CURRENT, game.current_player_index) ^ key(_CPI, _bucket(game.cpi, CPI_BUCKET))
+    for player in game.players:
+        h ^= key(
+            _PLAYER, player.seat, player.position, _bucket(player.cash, CASH_BUCKET),
+            _bucket(player.interest_rate, RATE_BUCKET), _bucket(player.tax_rate, RATE_BUCKET),
+            int(player.alive)
+        )
+    return h
+
+
+def full_hash(game):
+    """从头计算局面哈希（用于校验增量维护的结果）"""
+    h = board_key(game.seed, game.board.total_tiles)
+    for tile in game.board.tiles.materialized():
+        if tile.property is not None:
+            h ^= property_key(tile.property)
+    return h ^ dynamic_key(game)
@@ -6,6 +6,13 @@ from config import INITIAL_INTEREST_RATE, INITIAL_TAX_RATE
 
 class Player:
     """玩家类"""
+
+    # 使用__slots__去掉实例字典，降低大批量对局驻留内存时的占用
+    __slots__ = (
+        "name", "cash", "position", "properties", "is_ai",
+        "color", "interest_rate", "tax_rate", "seat", "alive",
+        "strategy",
+    )
     
     def __init__(self, name, cash, is_ai=False, color=(100, 150, 255)):
         self.name = name
@@ -16,6 +23,9 @@ class Player:
         self.color = color
         self.interest_rate = INITIAL_INTEREST_RATE
         self.tax_rate = INITIAL_TAX_RATE
+        self.seat = 0           # 座位号（在GameManager.players中的索引）
+        self.alive = True       # 破产后移出轮转
+        self.strategy = None    # AI决策策略，None时使用默认策略
         
     def get_total_wealth(self):
         """计算总财富"""
@@ -12,6 +12,11 @@ from config import (
 
 class Property:
     """地产类"""
+
+    __slots__ = (
+        "name", "base_price", "rent_rate", "tile_index",
+        "owner", "level", "property_price",
+    )
     
     def __init__(self, name, base_price, rent_rate, tile_index):
         self.name = name
@@ -13,29 +13,34 @@ class TileType(Enum):
     EMPTY = "空地"
 
 
+def get_tile_type_color(tile_type):
+    """根据地块类型返回默认颜色（不考虑地产归属）"""
+    from config import WHITE, GREEN, YELLOW, GRAY
+
+    if tile_type == TileType.START:
+        return GREEN
+    elif tile_type == TileType.CHANCE:
+        return YELLOW
+    elif tile_type == TileType.TAX:
+        return GRAY
+    return WHITE
+
+
 class Tile:
     """地块类"""
+
+    __slots__ = ("index", "tile_type", "position", "property")
     
     def __init__(self, index, tile_type, position):
         self.index = index
         self.tile_type = tile_type
-        self.position = position  # (x, y)坐标
+        self.position = position  # (x, y)坐标，同尺寸地图的所有对局共享同一元组
         self.property = None      # 关联的地产对象
         
     def get_color(self):
         """根据类型返回地块颜色"""
-        from config import WHITE, GREEN, YELLOW, GRAY, LIGHT_BLUE, LIGHT_RED
-        
-        if self.tile_type == TileType.START:
-            return GREEN
-        elif self.tile_type == TileType.CHANCE:
-            return YELLOW
-        elif self.tile_type == TileType.TAX:
-            return GRAY
-        elif self.tile_type == TileType.PROPERTY:
-            if self.property and self.property.owner:
-                # 根据拥有者返回不同颜色
-                return LIGHT_BLUE if self.property.owner.name == "玩家" else LIGHT_RED
-            return WHITE
-        return WHITE
+        if self.property and self.property.owner:
+            # 使用拥有者颜色的浅色版本
+            return tuple(min(255, c + 50) for c in self.property.owner.color)
+        return get_tile_type_color(self.tile_type)
 
@@ -0,0 +1,2 @@
+"""服务器模块"""
+
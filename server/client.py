@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""游戏服务器客户端 - 供pygame客户端以瘦客户端方式连接服务器"""
+
+import json
+import socket
+from managers import game_state
+from managers.state_sync import apply_changes
+
+
+def connect(address):
+    """连接服务器，address为 host:port 或 Unix套接字路径"""
+    if ":" in address and "/" not in address:
+        host, port = address.rsplit(":", 1)
+        return socket.create_connection((host, int(port)))
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+class RemoteSession:
+    """
+    远程回合会话
+    与GameSession接口一致；游戏逻辑和AI在服务器上运行，
+    本地只维护一份用于绘制的镜像GameManager
+    """
+
+    def __init__(self, address, room=None, player_specs=None, seed=None):
+        self.sock = connect(address)
+        self._buffer = b""
+        self._next_id = 1
+        self.game_manager = None
+        self.version = 0
+        self._status = None
+        self._resyncing = False
+        if room is None:
+            reply = self._request({"op": "create", "players": player_specs, "seed": seed})
+        else:
+            reply = self._request({"op": "join", "room": room})
+        if not reply["ok"]:
+            raise ConnectionError(reply.get("error"))
+        self.room = reply["room"]
+        self.seat = reply["seat"]
+        self.game_manager = game_state.build_game(reply["game"])
+        self._apply(reply)
+
+    def _apply(self, message):
+        if self.game_manager is None:
+            return     # 加入回复之前的推送已包含在回复的完整快照中
+        if "state" in message:
+            game_state.restore(self.game_manager, message["state"])
+            self.version = message["v"]
+        elif "delta" in message and not self._resyncing:
+            delta = message["delta"]
+            if delta["v"] == self.version + 1:
+                apply_changes(self.game_manager, delta)
+                self.version = delta["v"]
+            elif delta["v"] > self.version:
+                # 漏掉了中间的差量，重新获取完整快照
+                self._resync()
+                return
+        if "status" in message:
+            self._status = message["status"]
+
+    def _resync(self):
+        self._resyncing = True
+        try:
+            reply = self._request({"op": "sync"})
+        finally:
+            self._resyncing = False
+        self._apply(reply)
+
+    def _send(self, message):
+        message["id"] = self._next_id
+        self._next_id += 1
+        self.sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        return message["id"]
+
+    def _read_line(self, blocking):
+        while b"\n" not in self._buffer:
+            self.sock.setblocking(blocking)
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                return None
+            finally:
+                self.sock.setblocking(True)
+            if not data:
+                raise ConnectionError("服务器已断开")
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def _request(self, message):
+        request_id = self._send(message)
+        while True:
+            reply = self._read_line(blocking=True)
+            if reply.get("id") == request_id:
+                return reply
+            self._apply(reply)
+
+    def poll(self):
+        """处理服务器推送的状态（非阻塞）"""
+        while True:
+            message = self._read_line(blocking=False)
+            if message is None:
+                return
+            self._apply(message)
+
+    def is_human_turn(self):
+        gm = self.game_manager
+        return not gm.game_over and gm.current_player_index == self.seat
+
+    def apply(self, action, tile_index=None):
+        reply = self._request({"op": "action", "action": action, "tile": tile_index})
+        self._apply(reply)
+        return reply["ok"]
+
+    def status(self):
+        return self._status
+
+    def ai_can_act(self):
+        # AI由服务器执行
+        return False
+
+    def step_ai(self):
+        return False
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""异步游戏服务器 - 单进程承载大量独立房间
+
+协议：每行一个JSON消息（TCP或Unix套接字）
+    请求 {"id": 1, "op": "create", "players": [["玩家", false], ["AI", true]], "seed": 5}
+         {"id": 2, "op": "join", "room": 3}
+         {"id": 3, "op": "action", "action": "roll"}          # 出售时附带 "tile": 地块索引
+         {"id": 4, "op": "sync"}                              # 重新获取完整快照
+    应答 {"id": 1, "ok": true, ...}，失败时 {"id": 1, "ok": false, "error": "..."}
+    推送 {"op": "update", "delta": {...}, "status": {...}}（同房间其他玩家的动作或AI行动后）
+
+加入房间与sync返回完整快照 {"v": 版本号, "state": {...}}，
+之后的应答与推送只携带带版本号的差量（见managers.state_sync）。
+
+用法: python -m server.game_server --port 8765
+      python -m server.game_server --unix /tmp/monopoly.sock
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+from managers import game_state
+from managers.game_manager import GameManager, build_player_specs
+from managers.game_session import GameSession
+from managers.state_sync import StateSync
+
+
+class GameRoom:
+    """游戏房间：一局游戏及其连接的客户端"""
+
+    def __init__(self, room_id, player_specs, seed=None):
+        self.room_id = room_id
+        self.session = GameSession(GameManager(seed=seed, player_specs=player_specs))
+        self.sync = StateSync(self.game)
+        self.members = {}         # 连接 -> 座位
+        self._ai_task = None
+
+    @property
+    def game(self):
+        return self.session.game_manager
+
+    def free_human_seat(self):
+        taken = set(self.members.values())
+        for player in self.game.players:
+            if not player.is_ai and player.seat not in taken:
+                return player.seat
+        return None
+
+    def state_message(self):
+        """完整状态（含版本号），先把未同步的变化推送给已有连接"""
+        self.publish()
+        return dict(self.sync.full_snapshot(), room=self.room_id, status=self.session.status())
+
+    def publish(self, exclude=None):
+        """收集变化并推送给房间内的其他连接，返回同样内容的消息供应答使用"""
+        message = {"room": self.room_id, "status": self.session.status()}
+        delta = self.sync.collect()
+        if delta is not None:
+            message["delta"] = delta
+            update = dict(message, op="update")
+            for connection in self.members:
+                if connection is not exclude:
+                    connection.send(update)
+        return message
+
+    def schedule_ai(self):
+        """轮到AI时在后台逐步执行，每步之间让出事件循环"""
+        if self._ai_task is None and self.session.ai_can_act():
+            self._ai_task = asyncio.get_running_loop().create_task(self._run_ai())
+
+    async def _run_ai(self):
+        try:
+            while self.session.ai_can_act():
+                self.session.step_ai()
+                await asyncio.sleep(0)
+        finally:
+            self._ai_task = None
+        self.publish()
+
+
+class Connection:
+    """客户端连接"""
+
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.room = None
+        self.seat = None
+
+    def send(self, message):
+        self.writer.write(json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    async def serve(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    reply = self.handle(request)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                reply["id"] = request.get("id") if isinstance(request, dict) else None
+                self.send(reply)
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave()
+            self.writer.close()
+
+    def handle(self, request):
+        op = request["op"]
+        if op == "create":
+            specs = request.get("players") or build_player_specs()
+            room = self.server.create_room([tuple(spec) for spec in specs], request.get("seed"))
+            return self.join(room, request.get("seat"))
+        if op == "join":
+            return self.join(self.server.rooms[request["room"]], request.get("seat"))
+        if self.room is None:
+            raise ValueError("尚未加入房间")
+        if op in ("sync", "state"):
+            return dict(self.room.state_message(), ok=True)
+        if op == "action":
+            return self.act(request["action"], request.get("tile"))
+        raise ValueError(f"未知操作: {op}")
+
+    def join(self, room, seat=None):
+        self.leave()
+        if seat is None:
+            seat = room.free_human_seat()
+        self.room = room
+        self.seat = seat
+        # 先生成快照再加入成员：生成快照时会推送未发布的差量，新成员不应在加入回复之前收到
+        message = room.state_message()
+        room.members[self] = seat
+        return dict(message, ok=True, seat=seat, game=game_state.describe_game(room.game))
+
+    def leave(self):
+        if self.room is None:
+            return
+        self.room.members.pop(self, None)
+        if not self.room.members:
+            self.server.close_room(self.room)
+        self.room = None
+
+    def act(self, action, tile_index=None):
+        room = self.room
+        game = room.game
+        if self.seat is None or game.current_player_index != self.seat:
+            return dict(room.publish(exclude=self), ok=False, error="不是你的回合")
+        ok = room.session.apply(action, tile_index)
+        message = room.publish(exclude=self)
+        if ok:
+            room.schedule_ai()
+        return dict(message, ok=ok)
+
+
+class GameServer:
+    """游戏服务器"""
+
+    def __init__(self):
+        self.rooms = {}
+        self._room_ids = itertools.count(1)
+
+    def create_room(self, player_specs, seed=None):
+        room = GameRoom(next(self._room_ids), player_specs, seed)
+        self.rooms[room.room_id] = room
+        room.schedule_ai()
+        return room
+
+    def close_room(self, room):
+        self.rooms.pop(room.room_id, None)
+
+    async def _on_connect(self, reader, writer):
+        await Connection(self, reader, writer).serve()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            return await asyncio.start_unix_server(self._on_connect, path=unix_path)
+        return await asyncio.start_server(self._on_connect, host, port)
+
+
+async def _serve(args):
+    server = await GameServer().start(args.host, args.port, args.unix)
+    address = args.unix or f"{args.host}:{args.port}"
+    print(f"游戏服务器已启动: {address}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="大富翁游戏服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Unix套接字路径（指定时忽略host/port）")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""游戏服务器本地压测
+
+每个虚拟客户端占一个房间（1名人类座位 + 若干AI座位），不间断地执行合法动作，
+统计动作应答延迟与吞吐；对局结束后自动新建房间。
+
+用法: python -m server.load_test --rooms 1000 --duration 20 --spawn-server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+class LoadClient:
+    """压测客户端"""
+
+    def __init__(self, reader, writer, ai_count, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.ai_count = ai_count
+        self.latencies = latencies
+        self.next_id = 1
+        self.seat = None
+        self.games = 0
+        self.current = None
+        self.game_over = False
+        self.received_bytes = 0
+
+    async def read_message(self):
+        """读取一条消息，并跟踪当前玩家与是否结束（完整快照或差量）"""
+        line = await self.reader.readline()
+        self.received_bytes += len(line)
+        message = json.loads(line)
+        state = message.get("state") or message.get("delta") or {}
+        self.current = state.get("current", self.current)
+        self.game_over = state.get("game_over", self.game_over)
+        return message
+
+    async def request(self, message):
+        message["id"] = self.next_id
+        self.next_id += 1
+        start = time.perf_counter()
+        self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        while True:
+            reply = await self.read_message()
+            if reply.get("id") == message["id"]:
+                self.latencies.append(time.perf_counter() - start)
+                return reply
+
+    async def wait_for_turn(self, message):
+        """等待服务器推送轮到自己的状态"""
+        while not self.game_over and self.current != self.seat:
+            message = await self.read_message()
+        return message
+
+    def choose_action(self, message):
+        status = message["status"]
+        if status["waiting"] == "buy":
+            return {"action": "buy"}
+        if status["waiting"] == "upgrade":
+            return {"action": "skip_upgrade"}
+        if status["waiting"] == "sell":
+            return {"action": "sell", "tile": status["sell_options"][0]}
+        if status["action_taken"]:
+            return {"action": "end_turn"}
+        return {"action": "roll"}
+
+    async def run(self, deadline):
+        players = [["玩家", False]] + [[f"AI{i + 1}", True] for i in range(self.ai_count)]
+        while time.perf_counter() < deadline:
+            message = await self.request({"op": "create", "players": players, "seed": None})
+            self.seat = message["seat"]
+            self.games += 1
+            while time.perf_counter() < deadline:
+                message = await self.wait_for_turn(message)
+                if self.game_over:
+                    break
+                message = await self.request(dict(self.choose_action(message), op="action"))
+
+
+async def _run(args):
+    latencies = []
+    clients = []
+    for _ in range(args.rooms):
+        if args.unix:
+            reader, writer = await asyncio.open_unix_connection(args.unix, limit=2 ** 22)
+        else:
+            reader, writer = await asyncio.open_connection(args.host, args.port, limit=2 ** 22)
+        clients.append(LoadClient(reader, writer, args.ai, latencies))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client.run(start + args.duration) for client in clients))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        client.writer.close()
+
+    latencies.sort()
+    count = len(latencies)
+    p50 = latencies[count // 2] * 1000 if count else 0
+    p99 = latencies[min(count - 1, int(count * 0.99))] * 1000 if count else 0
+    print(f"房间数: {args.rooms}  完成请求: {count}  吞吐: {count / elapsed:.0f} 次/秒")
+    print(f"延迟 p50: {p50:.2f} ms  p99: {p99:.2f} ms")
+    print(f"开局数: {sum(client.games for client in clients)}")
+    if count:
+        print(f"平均每个请求接收: {sum(client.received_bytes for client in clients) / count:.0f} 字节")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="游戏服务器压测")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--ai", type=int, default=3, help="每个房间的AI座位数")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Unix套接字路径")
+    parser.add_argument("--spawn-server", action="store_true", help="启动独立的服务器进程（单核）")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn_server:
+        if args.unix is None:
+            args.unix = os.path.join(tempfile.mkdtemp(), "monopoly.sock")
+        server = subprocess.Popen([sys.executable, "-m", "server.game_server", "--unix", args.unix])
+        while not os.path.exists(args.unix):
+            time.sleep(0.05)
+    try:
+        asyncio.run(_run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
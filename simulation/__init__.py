@@ -0,0 +1,2 @@
+"""模拟模块"""
+
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""长时间锦标赛与参数扫描的断点续跑
+
+检查点是一个JSON文件，记录：
+- run: 运行参数（续跑时必须与检查点一致）
+- done: 已完成参数点的结果
+- current: 当前参数点已完成对局的统计（对局按序号依次进行，局数即下一局的序号）
+- in_flight: 被中断的进行中对局（状态快照与两个随机数生成器的状态）
+- store_next_id: 写检查点时结果库已提交的下一局ID
+
+每局的随机数生成器由种子决定，此外没有全局随机状态，因此续跑结果与一次跑完完全相同。
+写入时先写临时文件并fsync，再用os.replace替换，任何时刻崩溃都只会留下完整的新或旧检查点。
+结果库先提交再写检查点；两者之间崩溃时，续跑前删除结果库中检查点之后写入的对局（ResultsStore.rollback_to）。
+"""
+
+import json
+import os
+import signal
+import time
+from managers import game_state
+
+
+class Interrupted(Exception):
+    """收到停止信号，检查点已写出"""
+
+
+def _rng_state(rng):
+    version, internal, gauss = rng.getstate()
+    return [version, list(internal), gauss]
+
+
+def _set_rng_state(rng, state):
+    version, internal, gauss = state
+    rng.setstate((version, tuple(internal), gauss))
+
+
+def capture_game(game):
+    """进行中对局的可续跑状态（须在回合之间或AI决策点调用，此时没有回合内的临时状态）"""
+    if game.in_turn_state():
+        raise ValueError("对局处于回合中途（等待决策或待付款），无法保存")
+    return {
+        "state": game_state.snapshot(game),
+        "rng": _rng_state(game.rng),
+        "decision_rng": _rng_state(game.decision_rng),
+        "last_total_wealth": game.last_total_wealth,
+    }
+
+
+def resume_game(game, data):
+    """把capture_game的结果写回以相同种子与座位新建的GameManager"""
+    game_state.restore(game, data["state"])
+    game.reset_turn_state()
+    _set_rng_state(game.rng, data["rng"])
+    _set_rng_state(game.decision_rng, data["decision_rng"])
+    game.last_total_wealth = data["last_total_wealth"]
+
+
+class Checkpointer:
+    """
+    检查点文件的读写
+    due()在距上次写入超过interval秒或收到停止信号后返回True，调用开销只有一次时钟读取，
+    可在每回合后检查
+    """
+
+    def __init__(self, path, run, interval=60.0):
+        self.path = path
+        self.run = run
+        self.interval = interval
+        self.stop_requested = False
+        self._next_save = time.monotonic() + interval
+
+    def load(self):
+        """读取已有检查点，不存在时返回None"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data["run"] != self.run:
+            raise ValueError(f"检查点 {self.path} 与本次运行参数不一致")
+        return data
+
+    def due(self):
+        return self.stop_requested or time.monotonic() >= self._next_save
+
+    def save(self, data):
+        """原子写出检查点"""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(data, run=self.run), f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        if hasattr(os, "O_DIRECTORY"):
+            # 替换操作本身也要落盘，否则掉电后可能仍是旧检查点
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._next_save = time.monotonic() + self.interval
+
+    def handle_signals(self):
+        """SIGTERM/SIGINT时在下一个回合之间写检查点并停止；再次收到SIGINT则立即退出"""
+        def on_signal(signum, frame):
+            if self.stop_requested and signum == signal.SIGINT:
+                raise KeyboardInterrupt
+            self.stop_requested = True
+
+        signal.signal(signal.SIGTERM, on_signal)
+        signal.signal(signal.SIGINT, on_signal)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""经济时间序列
+
+EconomyTracker记录一局中每回合结束（CPI更新之后）的CPI、总财富以及各玩家的利率与税率：
+- 数据存放在按块预分配的定类型数组中，写满一块再分配下一块，已有数据不复制
+- 可选维护最近window回合的滑动统计（均值、方差、最小值、最大值），每回合更新O(1)
+- 总财富取update_cpi刚算出的last_total_wealth，不重复遍历地产；
+  结束对局的回合不更新CPI，在对局结束时计算一次
+批量对局时由RecordWriter(economy=True)逐局流式写出（只写序列，不维护滑动统计），见simulation.records。
+"""
+
+from collections import deque
+import numpy as np
+
+ROLLING_WINDOW = 50     # 滑动统计的回合数
+CHUNK_TURNS = 1024      # 每块预分配的回合数
+
+# 各列的类型；利率与税率每回合一行、每个座位一列
+COLUMNS = {
+    "turn": np.int32,
+    "cpi": np.float32,
+    "total_wealth": np.float64,
+    "interest_rate": np.float32,
+    "tax_rate": np.float32,
+}
+PLAYER_COLUMNS = ("interest_rate", "tax_rate")
+# 做滑动统计的序列（利率与税率取存活玩家的平均）
+ROLLING_SERIES = ("cpi", "total_wealth", "interest_rate", "tax_rate")
+
+
+class RollingStats:
+    """
+    最近window个值的均值、方差、最小值与最大值
+    均值与方差用Welford算法加入新值、移出旧值；最值用单调队列，均摊O(1)
+    """
+
+    __slots__ = ("window", "count", "mean", "_m2", "_ring", "_index", "_mins", "_maxs")
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._ring = [0.0] * window
+        self._index = 0            # 已加入的值的总数
+        self._mins = deque()       # (序号, 值)，值单调递增
+        self._maxs = deque()       # (序号, 值)，值单调递减
+
+    def add(self, value):
+        index = self._index
+        self._index = index + 1
+        slot = index % self.window
+        count = self.count
+        mean = self.mean
+        if count == self.window:
+            old = self._ring[slot]
+            count -= 1
+            if count:
+                delta = old - mean
+                mean -= delta / count
+                self._m2 -= delta * (old - mean)
+            else:
+                mean = self._m2 = 0.0
+        self._ring[slot] = value
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        self._m2 += delta * (value - mean)
+        self.count = count
+        self.mean = mean
+
+        expired = index - self.window
+        entry = (index, value)
+        mins = self._mins
+        while mins and mins[-1][1] >= value:
+            mins.pop()
+        mins.append(entry)
+        if mins[0][0] <= expired:
+            mins.popleft()
+        maxs = self._maxs
+        while maxs and maxs[-1][1] <= value:
+            maxs.pop()
+        maxs.append(entry)
+        if maxs[0][0] <= expired:
+            maxs.popleft()
+
+    @property
+    def variance(self):
+        """总体方差"""
+        return max(0.0, self._m2 / self.count) if self.count else 0.0
+
+    @property
+    def min(self):
+        return self._mins[0][1] if self._mins else 0.0
+
+    @property
+    def max(self):
+        return self._maxs[0][1] if self._maxs else 0.0
+
+    def summary(self):
+        return {"mean": self.mean, "std": self.variance ** 0.5, "min": self.min, "max": self.max}
+
+
+class EconomyTracker:
+    """
+    一局的经济时间序列
+    用法:
+        tracker = EconomyTracker(game)   # 记录开局状态并监听每回合结束
+        ...对局...
+        tracker.series("cpi"), tracker.rolling["cpi"].summary()
+    window为None时不维护滑动统计（rolling为空）
+    """
+
+    def __init__(self, game, window=ROLLING_WINDOW, chunk=CHUNK_TURNS):
+        self.seed = game.seed
+        self.players = len(game.players)
+        self.chunk = chunk
+        self.length = 0
+        self._chunks = []
+        self._block = None         # 当前块的各列（按COLUMNS顺序）
+        self._offset = chunk       # 当前块中下一行的位置
+        self._turn = None          # 最近记录的回合
+        self.rolling = {name: RollingStats(window) for name in ROLLING_SERIES} if window else {}
+        self._rolling = tuple(self.rolling[name] for name in ROLLING_SERIES) if window else None
+        self.record(game)
+        game.add_listener(self._on_event)
+
+    def _on_event(self, game, event_type, data):
+        if event_type == "cpi_update":
+            self.record(game, data["wealth"])
+        elif game.game_over and game.turn_count != self._turn:
+            # 结束对局的回合没有cpi_update：回合中途破产时在之后的turn_end记录，
+            # 回合结束时的检查淘汰时在game_over记录（判定结束的回合已经记录过）
+            self.record(game)
+
+    def _new_chunk(self):
+        block = {
+            name: np.empty((self.chunk, self.players) if name in PLAYER_COLUMNS else self.chunk, dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+        self._chunks.append(block)
+        self._block = tuple(block.values())
+        self._offset = 0
+
+    def record(self, game, wealth=None):
+        """记录当前状态（每回合结束时由事件调用）；wealth为已算出的总财富"""
+        if self._offset == self.chunk:
+            self._new_chunk()
+        offset = self._offset
+        self._offset = offset + 1
+        self.length += 1
+        self._turn = game.turn_count
+        turns, cpis, wealths, interests, taxes = self._block
+        cpi = game.cpi
+        if wealth is None:
+            wealth = game.get_total_game_wealth()
+        turns[offset] = game.turn_count
+        cpis[offset] = cpi
+        wealths[offset] = wealth
+        interest_total = tax_total = 0.0
+        alive = 0
+        for seat, player in enumerate(game.players):
+            interests[offset, seat] = player.interest_rate
+            taxes[offset, seat] = player.tax_rate
+            if player.alive:
+                interest_total += player.interest_rate
+                tax_total += player.tax_rate
+                alive += 1
+
+        if self._rolling is None:
+            return
+        cpi_stats, wealth_stats, interest_stats, tax_stats = self._rolling
+        cpi_stats.add(cpi)
+        wealth_stats.add(wealth)
+        if alive:
+            interest_stats.add(interest_total / alive)
+            tax_stats.add(tax_total / alive)
+
+    def series(self, name):
+        """一列的完整序列（利率与税率为 回合数×座位数 的二维数组）"""
+        if not self._chunks:
+            return np.empty(0, dtype=COLUMNS[name])
+        return np.concatenate([block[name] for block in self._chunks])[:self.length]
+
+    def columns(self):
+        return {name: self.series(name) for name in COLUMNS}
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""AI策略参数的进化优化
+
+每一代的候选参数与对手池中每种策略进行一对一对局，各候选使用同一组种子（公共随机数），
+每个种子交换座位各下一局，候选之间的得分差异只来自参数本身。
+对局按（候选, 对手, 种子块）拆成任务交给进程池并行执行。
+得分为胜局比例（未分胜负计半局）。每代保留得分最高的精英，
+其余由精英交叉、变异产生；各代最优者在一组新的种子上复核后写出策略文件。
+
+初始种群由预置策略的参数与随机参数组成；--load登记的策略只在用--seed-from列出时加入初始种群。
+
+用法: python -m simulation.evolve --opponents default cautious aggressive \\
+          --population 16 --generations 20 --games 50 --out best_strategies.json
+      python -m simulation.tournament default evo-g12-3 --load best_strategies.json
+      python -m simulation.evolve --load best_strategies.json --seed-from evo-g12-3 --out next.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from ai.ai_player import AIPlayer, BUILTIN_STRATEGIES, PARAM_NAMES, get_strategy, load_strategies
+from simulation.runner import play_game, DEFAULT_MAX_TURNS
+from simulation.sequential import WealthAdjudicator
+from config import TOTAL_TILES, START_CASH
+
+# 连续参数的取值范围
+PARAM_RANGES = {
+    "buy_probability": (0.0, 1.0),
+    "cash_reserve": (0.0, START_CASH / 2),
+    "upgrade_probability": (0.0, 1.0),
+}
+FLIP_PROBABILITY = 0.1      # 布尔参数的变异概率
+SEED_CHUNK = 10             # 每个并行任务包含的种子数
+
+
+def random_params(rng):
+    params = {name: rng.uniform(lo, hi) for name, (lo, hi) in PARAM_RANGES.items()}
+    params["sell_cheapest_first"] = rng.random() < 0.5
+    return params
+
+
+def crossover(a, b, rng):
+    """均匀交叉"""
+    return {name: (a if rng.random() < 0.5 else b)[name] for name in PARAM_NAMES}
+
+
+def mutate(params, sigma, rng):
+    """连续参数加高斯噪声（标准差为取值范围的sigma倍），布尔参数按概率翻转"""
+    child = dict(params)
+    for name, (lo, hi) in PARAM_RANGES.items():
+        child[name] = min(hi, max(lo, child[name] + rng.gauss(0, sigma * (hi - lo))))
+    if rng.random() < FLIP_PROBABILITY:
+        child["sell_cheapest_first"] = not child["sell_cheapest_first"]
+    return child
+
+
+def _evaluate(task):
+    """工作进程：候选在一块种子上与一个对手对局（每个种子交换座位各一局），返回 (候选序号, 得分, 局数)"""
+    index, params, opponent, seeds, total_tiles, board_seed, max_turns, adjudicate = task
+    candidate = AIPlayer("candidate", **params)
+    adjudicator = WealthAdjudicator(adjudicate) if adjudicate else None
+    score = 0.0
+    for seed in seeds:
+        for seat in (0, 1):
+            specs = [(opponent.strategy_id, True, opponent)]
+            specs.insert(seat, ("candidate", True, candidate))
+            game = play_game(seed, specs, total_tiles, max_turns, board_seed, adjudicator=adjudicator)
+            if game.winner is None:
+                score += 0.5
+            elif game.winner.seat == seat:
+                score += 1.0
+    return index, score, 2 * len(seeds)
+
+
+class Evolution:
+    """进化优化器"""
+
+    def __init__(self, opponents, population=16, elite=4, games=50, workers=None, seed=0,
+                 total_tiles=TOTAL_TILES, board_seed=None, max_turns=DEFAULT_MAX_TURNS, adjudicate=8.0,
+                 sigma=0.2, sigma_decay=0.9, min_sigma=0.02, seed_strategies=BUILTIN_STRATEGIES):
+        self.opponents = [get_strategy(opponent) for opponent in opponents]
+        self.population_size = population
+        self.elite = elite
+        self.games = games                  # 每代每个对手的种子数（每个种子两局）
+        self.workers = workers or os.cpu_count() or 1
+        self.rng = random.Random(seed)
+        self.next_game_seed = seed * 1000003
+        self.total_tiles = total_tiles
+        self.board_seed = board_seed        # None时每局的地图由对局种子决定
+        self.max_turns = max_turns
+        self.adjudicate = adjudicate
+        self.sigma = sigma
+        self.sigma_decay = sigma_decay
+        self.min_sigma = min_sigma
+        self.generation = 0
+        self.hall_of_fame = []              # 各代最优者: (得分, 参数, 代数)
+
+        # 初始种群：seed_strategies（默认为预置策略）的参数加随机参数
+        self.population = [get_strategy(name).params() for name in seed_strategies][:population]
+        while len(self.population) < population:
+            self.population.append(random_params(self.rng))
+
+        context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        self.pool = context.Pool(self.workers)
+
+    def _seeds(self, count):
+        seeds = range(self.next_game_seed, self.next_game_seed + count)
+        self.next_game_seed += count
+        return seeds
+
+    def evaluate(self, candidates, seeds):
+        """所有候选在同一组种子上对局，返回各候选的得分（胜局比例）"""
+        tasks = [
+            (index, params, opponent, seeds[start:start + SEED_CHUNK],
+             self.total_tiles, self.board_seed, self.max_turns, self.adjudicate)
+            for index, params in enumerate(candidates)
+            for opponent in self.opponents
+            for start in range(0, len(seeds), SEED_CHUNK)
+        ]
+        scores = [0.0] * len(candidates)
+        played = [0] * len(candidates)
+        for index, score, count in self.pool.imap_unordered(_evaluate, tasks):
+            scores[index] += score
+            played[index] += count
+        return [score / count for score, count in zip(scores, played)]
+
+    def step(self):
+        """评估当前种群并产生下一代，返回按得分排序的 [(得分, 参数)]"""
+        scores = self.evaluate(self.population, self._seeds(self.games))
+        ranked = sorted(zip(scores, self.population), key=lambda item: item[0], reverse=True)
+        self.hall_of_fame.append((ranked[0][0], ranked[0][1], self.generation))
+
+        # 精英原样进入下一代（下一代换一组种子重新评估，避免只是碰巧得分高）
+        elites = [params for _, params in ranked[:self.elite]]
+        children = []
+        while len(elites) + len(children) < self.population_size:
+            a, b = self.rng.sample(elites, 2) if len(elites) > 1 else (elites[0], elites[0])
+            children.append(mutate(crossover(a, b, self.rng), self.sigma, self.rng))
+        self.population = elites + children
+        self.sigma = max(self.min_sigma, self.sigma * self.sigma_decay)
+        self.generation += 1
+        return ranked
+
+    def validate(self, games):
+        """在一组新的种子上复核各代最优者，返回按复核得分排序的 [(得分, 参数, 代数)]"""
+        # 精英可能连续多代都是最优者，同一组参数只复核一次
+        unique = {}
+        for _, params, generation in self.hall_of_fame:
+            unique.setdefault(tuple(params[name] for name in PARAM_NAMES), (params, generation))
+        candidates = list(unique.values())
+        scores = self.evaluate([params for params, _ in candidates], self._seeds(games))
+        results = [(score, params, generation) for score, (params, generation) in zip(scores, candidates)]
+        return sorted(results, key=lambda item: item[0], reverse=True)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+def write_strategies(path, results, opponents, games):
+    """写出策略文件（先写临时文件再替换）"""
+    data = {
+        "opponents": list(opponents),
+        "strategies": [
+            {"strategy_id": f"evo-g{generation}-{rank}", "params": params,
+             "score": score, "games": games}
+            for rank, (score, params, generation) in enumerate(results)
+        ],
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _describe(params):
+    return (f"买入 {params['buy_probability']:.2f}  保留 {params['cash_reserve']:.0f}  "
+            f"升级 {params['upgrade_probability']:.2f}  "
+            f"{'先卖便宜' if params['sell_cheapest_first'] else '先卖贵'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI策略参数的进化优化")
+    parser.add_argument("--opponents", nargs="+", default=["default", "cautious", "aggressive"])
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--elite", type=int, default=4)
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--games", type=int, default=50, help="每代每个对手的种子数（每个种子交换座位各一局）")
+    parser.add_argument("--validate-games", type=int, default=200, help="复核各代最优者的种子数")
+    parser.add_argument("--keep", type=int, default=5, help="写出的策略数")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--board-seed", type=int, default=0, help="地图种子（所有对局共用）")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--adjudicate", type=float, default=8.0, metavar="RATIO",
+                        help="领先者财富达到第二名的RATIO倍时提前判定胜负（0为不判定）")
+    parser.add_argument("--load", metavar="PATH", action="append", default=[],
+                        help="先登记策略文件中的策略（本程序的输出），可作为对手或用--seed-from加入初始种群")
+    parser.add_argument("--seed-from", nargs="+", default=[], metavar="NAME",
+                        help="除预置策略外加入初始种群的策略")
+    parser.add_argument("--out", default="best_strategies.json")
+    args = parser.parse_args(argv)
+
+    for path in args.load:
+        load_strategies(path)
+    # 指定的策略排在前面，种群较小时优先保留
+    seed_strategies = args.seed_from + [name for name in BUILTIN_STRATEGIES if name not in args.seed_from]
+    evolution = Evolution(args.opponents, args.population, args.elite, args.games, args.workers,
+                          args.seed, args.tiles, args.board_seed, args.max_turns, args.adjudicate,
+                          seed_strategies=seed_strategies)
+    games_per_generation = args.population * len(args.opponents) * args.games * 2
+    try:
+        for _ in range(args.generations):
+            start = time.perf_counter()
+            ranked = evolution.step()
+            elapsed = time.perf_counter() - start
+            best_score, best_params = ranked[0]
+            print(f"第 {evolution.generation - 1} 代  最高 {best_score * 100:.1f}%  "
+                  f"中位 {ranked[len(ranked) // 2][0] * 100:.1f}%  {_describe(best_params)}  "
+                  f"({games_per_generation} 局, {games_per_generation / elapsed:.0f} 局/秒)")
+        results = evolution.validate(args.validate_games)[:args.keep]
+    finally:
+        evolution.close()
+
+    write_strategies(args.out, results, args.opponents, args.validate_games * 2 * len(args.opponents))
+    print(f"复核结果已写入 {args.out}:")
+    for rank, (score, params, generation) in enumerate(results):
+        print(f"  evo-g{generation}-{rank}: {score * 100:.1f}%  {_describe(params)}")
+
+
+if __name__ == "__main__":
+    main()
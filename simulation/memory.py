@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""对局内存占用测量
+
+用法: python -m simulation.memory [对局数]
+"""
+
+import gc
+import sys
+import tracemalloc
+from managers.game_manager import GameManager
+
+
+def measure_game_footprint(count=1000, factory=GameManager):
+    """
+    测量单局游戏的平均驻留内存（字节）
+    同时创建count局并保持引用，用tracemalloc统计新增分配后取平均值，
+    这样共享的布局缓存只在首局计入一次，与大批量驻留时的真实情况一致
+    """
+    # 先创建一局，预热布局缓存与模块级对象
+    factory()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        games = [factory() for _ in range(count)]
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del games
+    return (after - before) / count
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 1000
+    per_game = measure_game_footprint(count)
+    print(f"对局数: {count}")
+    print(f"每局内存: {per_game / 1024:.2f} KiB")
+    print(f"每GB可驻留对局: {int(1024 ** 3 / per_game)}")
+
+
+if __name__ == "__main__":
+    main()
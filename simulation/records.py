@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""对局记录的流式写出
+
+每局生成一条紧凑记录（可选逐回合记录与经济时间序列），按块缓冲后交给后台线程写盘，
+内存占用只与块大小和队列长度有关，与对局总数无关。
+支持两种格式：
+- jsonl: 每行一条JSON记录
+- npz: 每块一个列式二进制文件，玩家维度的数据按偏移量展平（CSR布局）
+"""
+
+import json
+import os
+import queue
+import threading
+import numpy as np
+from simulation.economy import EconomyTracker
+
+
+class CpiTrace:
+    """以O(1)内存累计一局中每回合结束时的CPI轨迹摘要"""
+
+    __slots__ = ("count", "total", "min", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, cpi):
+        if self.count == 0:
+            self.min = self.max = cpi
+        else:
+            self.min = min(self.min, cpi)
+            self.max = max(self.max, cpi)
+        self.count += 1
+        self.total += cpi
+        self.last = cpi
+
+    def summary(self):
+        mean = self.total / self.count if self.count else self.last
+        return {"min": self.min, "max": self.max, "mean": mean, "final": self.last}
+
+
+def build_game_record(game, cpi_trace=None):
+    """根据GameManager的最终状态生成单局记录"""
+    if cpi_trace is None:
+        cpi_trace = CpiTrace()
+        cpi_trace.add(game.cpi)
+    return {
+        "seed": game.seed,
+        "turns": game.turn_count,
+        "finished": game.game_over,
+        "winner": game.winner.seat if game.winner else -1,
+        "cash": [player.cash for player in game.players],
+        "wealth": [player.get_total_wealth() for player in game.players],
+        "cpi": cpi_trace.summary(),
+    }
+
+
+class RecordWriter:
+    """
+    流式对局记录写出器
+    用法:
+        with RecordWriter("results", fmt="npz", per_turn=True) as writer:
+            game = GameManager(seed=seed)
+            writer.attach(game)
+            ...对局...
+            writer.write_game(game)
+    """
+
+    def __init__(self, out_dir, fmt="jsonl", chunk_size=4096, per_turn=False, max_pending_chunks=4,
+                 economy=False):
+        if fmt not in ("jsonl", "npz"):
+            raise ValueError(f"不支持的记录格式: {fmt}")
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.per_turn = per_turn
+        self.economy = economy          # 是否写出经济时间序列（见simulation.economy）
+        os.makedirs(out_dir, exist_ok=True)
+
+        self._games = []
+        self._turns = []
+        self._traces = {}
+        self._trackers = {}
+        self._economy = []              # 待写出的各局经济序列: (种子, 各列)
+        self._economy_rows = 0
+        self._chunk_index = {"games": 0, "turns": 0, "economy": 0}
+        self.games_written = 0
+
+        # 有界队列：写盘跟不上时阻塞生产者，避免缓冲无限增长
+        self._queue = queue.Queue(maxsize=max_pending_chunks)
+        self._error = None
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def attach(self, game):
+        """监听对局事件，累计CPI轨迹与（可选）逐回合记录、经济时间序列"""
+        trace = CpiTrace()
+        trace.add(game.cpi)
+        self._traces[id(game)] = trace
+        game.add_listener(self._on_event)
+        if self.economy:
+            # 写出的只有逐回合序列，不维护滑动统计
+            self._trackers[id(game)] = EconomyTracker(game, window=None)
+
+    def _on_event(self, game, event_type, data):
+        if event_type != "turn_end":
+            return
+        trace = self._traces.get(id(game))
+        if trace is not None:
+            trace.add(game.cpi)
+        if self.per_turn:
+            player = game.players[data["seat"]]
+            self._turns.append((
+                game.seed if game.seed is not None else -1,
+                data["turn"],
+                data["seat"],
+                player.cash,
+                player.position,
+                game.cpi,
+            ))
+            if len(self._turns) >= self.chunk_size:
+                self._submit("turns", self._turns)
+                self._turns = []
+
+    def write_game(self, game):
+        """写入一局的最终记录"""
+        self._games.append(build_game_record(game, self._traces.pop(id(game), None)))
+        self.games_written += 1
+        if len(self._games) >= self.chunk_size:
+            self._submit("games", self._games)
+            self._games = []
+        tracker = self._trackers.pop(id(game), None)
+        if tracker is not None:
+            # 经济序列按回合数计块大小
+            self._economy.append((game.seed if game.seed is not None else -1, tracker.columns()))
+            self._economy_rows += tracker.length
+            if self._economy_rows >= self.chunk_size:
+                self._submit("economy", self._economy)
+                self._economy = []
+                self._economy_rows = 0
+
+    def flush(self):
+        """提交当前未满的缓冲块"""
+        if self._games:
+            self._submit("games", self._games)
+            self._games = []
+        if self._turns:
+            self._submit("turns", self._turns)
+            self._turns = []
+        if self._economy:
+            self._submit("economy", self._economy)
+            self._economy = []
+            self._economy_rows = 0
+
+    def close(self):
+        """提交剩余数据并等待后台线程写完"""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            raise self._error
+
+    def _submit(self, kind, rows):
+        if self._error is not None:
+            raise self._error
+        index = self._chunk_index[kind]
+        self._chunk_index[kind] += 1
+        self._queue.put((kind, index, rows))
+
+    def _flush_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                kind, index, rows = item
+                if self.fmt == "jsonl":
+                    self._write_jsonl(kind, rows)
+                else:
+                    self._write_npz(kind, index, rows)
+            except Exception as e:  # 记录错误，由生产者线程在下一次提交时抛出
+                self._error = e
+
+    def _write_jsonl(self, kind, rows):
+        if kind == "economy":
+            # 每局一行，各列为逐回合的数组（float32列保留7位小数，避免转为双精度后的尾数噪声）
+            rows = (
+                dict({"seed": seed}, **{
+                    name: (values.astype(np.float64).round(7) if values.dtype == np.float32 else values).tolist()
+                    for name, values in columns.items()
+                })
+                for seed, columns in rows
+            )
+        elif kind == "turns":
+            rows = (
+                {"seed": r[0], "turn": r[1], "seat": r[2], "cash": r[3], "position": r[4], "cpi": r[5]}
+                for r in rows
+            )
+        data = "".join(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows)
+        with open(os.path.join(self.out_dir, f"{kind}.jsonl"), "a", encoding="utf-8") as f:
+            f.write(data)
+
+    def _write_npz(self, kind, index, rows):
+        if kind == "games":
+            counts = [len(r["cash"]) for r in rows]
+            columns = {
+                "seed": np.array([r["seed"] if r["seed"] is not None else -1 for r in rows], dtype=np.int64),
+                "turns": np.array([r["turns"] for r in rows], dtype=np.int32),
+                "finished": np.array([r["finished"] for r in rows], dtype=np.bool_),
+                "winner": np.array([r["winner"] for r in rows], dtype=np.int16),
+                "player_offsets": np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+                "cash": np.array([c for r in rows for c in r["cash"]], dtype=np.float64),
+                "wealth": np.array([w for r in rows for w in r["wealth"]], dtype=np.float64),
+            }
+            for key in ("min", "max", "mean", "final"):
+                columns[f"cpi_{key}"] = np.array([r["cpi"][key] for r in rows], dtype=np.float32)
+        elif kind == "economy":
+            # 每回合一行；利率与税率按座位展平，player_offsets为各行的起始下标（CSR布局）
+            columns = {
+                "seed": np.concatenate([np.full(len(c["turn"]), seed, dtype=np.int64) for seed, c in rows]),
+            }
+            for name in rows[0][1]:
+                columns[name] = np.concatenate([c[name].ravel() for _, c in rows])
+            counts = np.concatenate([np.full(len(c["turn"]), c["interest_rate"].shape[1]) for _, c in rows])
+            columns["player_offsets"] = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        else:
+            seeds, turns, seats, cash, positions, cpis = zip(*rows)
+            columns = {
+                "seed": np.array(seeds, dtype=np.int64),
+                "turn": np.array(turns, dtype=np.int32),
+                "seat": np.array(seats, dtype=np.int16),
+                "cash": np.array(cash, dtype=np.float64),
+                "position": np.array(positions, dtype=np.int64),
+                "cpi": np.array(cpis, dtype=np.float32),
+            }
+        path = os.path.join(self.out_dir, f"{kind}_{index:05d}.npz")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp_path, path)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""对局录像（关键帧 + 差量）
+
+每隔interval回合保存一个完整快照作为关键帧，其余回合只保存差量，
+跳转到任意回合最多只需应用interval个差量，与对局长度无关。
+
+用法: python -m simulation.replay --seed 5 --ai 3 --out game.replay.json
+      python main.py --replay game.replay.json
+"""
+
+import argparse
+import json
+from managers import game_state
+from managers.game_manager import build_player_specs
+from simulation.runner import play_game, DEFAULT_MAX_TURNS
+from config import TOTAL_TILES, REPLAY_KEYFRAME_INTERVAL
+
+
+class ReplayRecorder:
+    """录像记录器，作为事件监听器挂到GameManager上"""
+
+    def __init__(self, interval=REPLAY_KEYFRAME_INTERVAL):
+        self.interval = interval
+        self.game_info = None
+        self.keyframes = []
+        self.deltas = []
+        self._last = None
+        self._previous = None      # 最后一回合之前的状态
+        self._final = None         # 对局结束时的状态（尚未有回合记录它时）
+
+    def attach(self, game):
+        self.game_info = game_state.describe_game(game)
+        self._last = game_state.snapshot(game)
+        self._previous = None
+        self._final = None
+        self.keyframes = [self._last]
+        self.deltas = []
+        game.add_listener(self._on_event)
+
+    def _on_event(self, game, event_type, data):
+        if event_type == "turn_end":
+            state = game_state.snapshot(game)
+            self.deltas.append(game_state.diff(self._last, state))
+            if len(self.deltas) % self.interval == 0:
+                self.keyframes.append(state)
+            self._previous, self._last = self._last, state
+            self._final = None
+        elif event_type == "game_over":
+            # check_game_over与adjudicate在turn_end之后结束对局，结束时的状态并入最后一回合；
+            # 回合中途破产出局时之后还有turn_end，由它记录
+            self._final = game_state.snapshot(game)
+
+    def to_replay(self):
+        keyframes, deltas = self.keyframes, self.deltas
+        if self._final is not None:
+            if deltas:
+                deltas = deltas[:-1] + [game_state.diff(self._previous, self._final)]
+                if len(deltas) % self.interval == 0:
+                    keyframes = keyframes[:-1] + [self._final]
+            else:
+                keyframes = [self._final]
+        return Replay(self.game_info, self.interval, keyframes, deltas)
+
+
+class Replay:
+    """已记录的对局录像，支持常数时间跳转"""
+
+    def __init__(self, game_info, interval, keyframes, deltas):
+        self.game_info = game_info
+        self.interval = interval
+        self.keyframes = keyframes
+        self.deltas = deltas
+
+    @property
+    def total_turns(self):
+        return len(self.deltas)
+
+    def seek(self, turn, current_state=None, current_turn=None):
+        """
+        返回第turn回合结束时的状态
+        提供当前状态且目标在其后不超过一个关键帧间隔时，从当前状态继续应用差量
+        """
+        turn = max(0, min(turn, self.total_turns))
+        keyframe = turn // self.interval
+        if (current_state is not None and current_turn is not None
+                and current_turn <= turn and current_turn >= keyframe * self.interval):
+            state, start = current_state, current_turn
+        else:
+            state, start = self.keyframes[keyframe], keyframe * self.interval
+        for i in range(start, turn):
+            state = game_state.apply_delta(state, self.deltas[i])
+        return state
+
+    def save(self, path):
+        data = {
+            "version": 1,
+            "game": self.game_info,
+            "interval": self.interval,
+            "keyframes": self.keyframes,
+            "deltas": self.deltas,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["game"], data["interval"], data["keyframes"], data["deltas"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="录制一局AI对局")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai", type=int, default=2, help="AI玩家数")
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--interval", type=int, default=REPLAY_KEYFRAME_INTERVAL)
+    parser.add_argument("--out", default="game.replay.json")
+    args = parser.parse_args(argv)
+
+    recorder = ReplayRecorder(args.interval)
+    play_game(args.seed, build_player_specs(0, args.ai), args.tiles, args.max_turns, setup=recorder.attach)
+    recorder.to_replay().save(args.out)
+    print(f"已录制 {len(recorder.deltas)} 回合 -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""本地SQLite模拟结果库
+
+表结构：
+- configs:  对局参数（初始税率、初始利率、地块数、玩家数及完整参数JSON）
+- games:    每局一行（参数、种子、回合数、结束方式、胜者座位）
+            finished: 0 达到回合上限, 1 只剩一名玩家, 2 提前判定
+- outcomes: 每局每名玩家一行（策略、是否获胜、最终现金与财富）
+- strategy_stats: 按(策略, 参数)汇总的参与局数与获胜局数，随每批写入增量更新，
+  胜率查询只需汇总少量行，与明细行数无关；同一策略占多个座位的对局只计一局
+
+用法: python -m simulation.results_store results.db --strategy aggressive --tax-min 0.01 --tax-max 0.03
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    params TEXT NOT NULL UNIQUE,
+    tax_rate REAL,
+    interest_rate REAL,
+    total_tiles INTEGER,
+    num_players INTEGER
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    config_id INTEGER NOT NULL REFERENCES configs(id),
+    seed INTEGER,
+    turns INTEGER NOT NULL,
+    finished INTEGER NOT NULL,
+    winner INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seat INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    config_id INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    cash REAL NOT NULL,
+    wealth REAL NOT NULL,
+    PRIMARY KEY (game_id, seat)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS strategy_stats (
+    strategy TEXT NOT NULL,
+    config_id INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (strategy, config_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_configs_tax ON configs(tax_rate);
+CREATE INDEX IF NOT EXISTS idx_games_seed ON games(seed);
+CREATE INDEX IF NOT EXISTS idx_games_config ON games(config_id);
+CREATE INDEX IF NOT EXISTS idx_outcomes_strategy ON outcomes(strategy, config_id, won);
+"""
+
+
+def strategy_id_of(player):
+    """玩家的策略标识，人类玩家记为human"""
+    if not player.is_ai:
+        return "human"
+    return player.strategy.strategy_id if player.strategy else "default"
+
+
+class ResultsStore:
+    """
+    模拟结果库
+    写入按批缓冲，每批在一个事务内executemany提交；使用WAL模式，查询与写入互不阻塞。
+    假定同一时刻只有一个写入进程（局ID由本进程分配）
+    """
+
+    def __init__(self, path, batch_size=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._games = []
+        self._outcomes = []
+        # 下一局的ID；flush之后小于该值的对局均已提交
+        self.next_game_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM games").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_config_id(self, params):
+        """获取（必要时登记）一组对局参数的ID"""
+        key = json.dumps(params, sort_keys=True)
+        row = self.conn.execute("SELECT id FROM configs WHERE params = ?", (key,)).fetchone()
+        if row:
+            return row[0]
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO configs (params, tax_rate, interest_rate, total_tiles, num_players) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, params.get("tax_rate"), params.get("interest_rate"),
+                 params.get("total_tiles"), params.get("num_players"))
+            )
+        return cursor.lastrowid
+
+    def add_game(self, game, config_id):
+        """缓冲一局结果，攒满一批后提交"""
+        game_id = self.next_game_id
+        self.next_game_id += 1
+        winner = game.winner.seat if game.winner else -1
+        finished = 2 if game.adjudicated else int(game.game_over)
+        self._games.append((game_id, config_id, game.seed, game.turn_count, finished, winner))
+        for player in game.players:
+            self._outcomes.append((
+                game_id, player.seat, strategy_id_of(player), config_id,
+                int(player.seat == winner), player.cash, player.get_total_wealth()
+            ))
+        if len(self._games) >= self.batch_size:
+            self.flush()
+        return game_id
+
+    def flush(self):
+        """在单个事务内提交缓冲的结果"""
+        if not self._games:
+            return
+        # 每局每种策略计一次（同一局只有一个座位获胜）
+        per_game = {}
+        for game_id, _, strategy, config_id, won, _, _ in self._outcomes:
+            key = (game_id, strategy, config_id)
+            per_game[key] = per_game.get(key, 0) | won
+        stats = {}
+        for (_, strategy, config_id), won in per_game.items():
+            entry = stats.setdefault((strategy, config_id), [0, 0])
+            entry[0] += 1
+            entry[1] += won
+        with self.conn:
+            self.conn.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?)", self._games)
+            self.conn.executemany("INSERT INTO outcomes VALUES (?, ?, ?, ?, ?, ?, ?)", self._outcomes)
+            self.conn.executemany(
+                "INSERT INTO strategy_stats VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (strategy, config_id) DO UPDATE SET "
+                "games = games + excluded.games, wins = wins + excluded.wins",
+                [(strategy, config_id, g, w) for (strategy, config_id), (g, w) in stats.items()]
+            )
+        self._games = []
+        self._outcomes = []
+
+    def rollback_to(self, next_game_id):
+        """删除ID不小于next_game_id的对局并扣回汇总，返回删除的局数（用于续跑前撤销检查点之后写入的结果）"""
+        self._games = []
+        self._outcomes = []
+        with self.conn:
+            stats = self.conn.execute(
+                "SELECT COUNT(DISTINCT game_id), COALESCE(SUM(won), 0), strategy, config_id FROM outcomes "
+                "WHERE game_id >= ? GROUP BY strategy, config_id", (next_game_id,)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE strategy_stats SET games = games - ?, wins = wins - ? "
+                "WHERE strategy = ? AND config_id = ?", stats
+            )
+            self.conn.execute("DELETE FROM outcomes WHERE game_id >= ?", (next_game_id,))
+            removed = self.conn.execute("DELETE FROM games WHERE id >= ?", (next_game_id,)).rowcount
+        self.next_game_id = next_game_id
+        return removed
+
+    def close(self):
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
+
+    def win_rate(self, strategy, tax_min=None, tax_max=None):
+        """查询策略在税率区间内的 (获胜局数, 参与局数)"""
+        sql = "SELECT COALESCE(SUM(games), 0), COALESCE(SUM(wins), 0) FROM strategy_stats WHERE strategy = ?"
+        args = [strategy]
+        if tax_min is not None or tax_max is not None:
+            sql += " AND config_id IN (SELECT id FROM configs WHERE tax_rate BETWEEN ? AND ?)"
+            args += [tax_min if tax_min is not None else float("-inf"),
+                     tax_max if tax_max is not None else float("inf")]
+        games, wins = self.conn.execute(sql, args).fetchone()
+        return wins, games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="查询策略胜率")
+    parser.add_argument("db")
+    parser.add_argument("--strategy", required=True)
+    parser.add_argument("--tax-min", type=float)
+    parser.add_argument("--tax-max", type=float)
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.db)
+    start = time.perf_counter()
+    wins, games = store.win_rate(args.strategy, args.tax_min, args.tax_max)
+    elapsed = (time.perf_counter() - start) * 1000
+    store.close()
+    rate = wins / games if games else 0.0
+    print(f"{args.strategy}: {wins}/{games} 胜率 {rate * 100:.2f}%（查询 {elapsed:.1f} ms）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""基于fork的并行推演（rollout）
+
+从一局已完全建立的对局（地图、玩家、缓存均已就绪）fork出子进程，每个子进程推演一次：
+子进程通过写时复制与父进程共享全部内存页，对局状态无需pickle，
+只有推演结果经管道传回。任务中的prepare回调也随fork继承，闭包、lambda均可直接使用。
+子进程中的修改不会影响父进程的对局。
+
+仅适用于支持fork的平台（Linux、macOS）；其他平台退化为在本进程内深拷贝后依次推演。
+
+用法: python -m simulation.rollouts --ai 3 --warmup-turns 30 --rollouts 400 --workers 4
+"""
+
+import argparse
+import copy
+import gc
+import os
+import pickle
+import select
+import signal
+import struct
+import time
+from managers.game_manager import build_player_specs
+from simulation.runner import play_game, DEFAULT_MAX_TURNS
+from config import TOTAL_TILES
+
+HAS_FORK = hasattr(os, "fork")
+
+# 结果帧头：任务序号、数据长度
+_FRAME = struct.Struct("<II")
+
+
+def _write_frame(fd, index, value):
+    data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    view = memoryview(_FRAME.pack(index, len(data)) + data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def rollout_outcome(game):
+    """默认的推演结果：(胜者座位(-1为未分胜负), 回合数, 各座位财富)"""
+    return (game.winner.seat if game.winner else -1, game.turn_count,
+            [player.get_total_wealth() for player in game.players])
+
+
+def _play_out(game, seed, prepare, max_turns, evaluate):
+    """在（已复制的）对局上完成一次推演"""
+    game.event_listeners = []         # 父进程的监听器可能持有文件、套接字等，推演中不触发
+    game.reseed(seed)
+    for player in game.players:
+        player.is_ai = True           # 推演中所有座位都由AI策略决策
+    if prepare is not None:
+        prepare(game)
+    while not game.game_over and game.turn_count < max_turns:
+        game.play_ai_turn()
+    return evaluate(game)
+
+
+class ForkRollouts:
+    """
+    并行推演器
+    任务为种子或 (种子, prepare) 元组；prepare(game)在推演开始前调用，
+    可用于施加待评估的决策。推演从回合之间的状态开始。
+    """
+
+    def __init__(self, game, workers=None, max_turns=DEFAULT_MAX_TURNS, evaluate=rollout_outcome):
+        self.game = game
+        self.workers = workers or os.cpu_count() or 1
+        self.max_turns = max_turns
+        self.evaluate = evaluate
+
+    def _task(self, task):
+        if isinstance(task, tuple):
+            return task
+        return task, None
+
+    def run(self, tasks):
+        """执行全部推演，按任务顺序返回结果"""
+        tasks = [self._task(task) for task in tasks]
+        if not HAS_FORK:
+            return [
+                _play_out(copy.deepcopy(self.game), seed, prepare, self.max_turns, self.evaluate)
+                for seed, prepare in tasks
+            ]
+
+        # 冻结已有对象，子进程的垃圾回收不再遍历（并因此复制）父进程的内存页
+        gc.freeze()
+        workers = {}        # 管道读端 -> (工作进程pid, 未解析的数据)
+        try:
+            for w in range(min(self.workers, len(tasks))):
+                read_fd, write_fd = os.pipe()
+                pid = os.fork()
+                if pid == 0:
+                    os.close(read_fd)
+                    self._worker_main(tasks, range(w, len(tasks), self.workers), write_fd)
+                os.close(write_fd)
+                workers[read_fd] = (pid, bytearray())
+        finally:
+            gc.unfreeze()
+
+        results = [None] * len(tasks)
+        errors = []
+        try:
+            while workers:
+                readable, _, _ = select.select(list(workers), [], [])
+                for fd in readable:
+                    pid, buffer = workers[fd]
+                    chunk = os.read(fd, 1 << 16)
+                    if chunk:
+                        buffer += chunk
+                        while len(buffer) >= _FRAME.size:
+                            index, length = _FRAME.unpack_from(buffer)
+                            if len(buffer) < _FRAME.size + length:
+                                break
+                            ok, value = pickle.loads(buffer[_FRAME.size:_FRAME.size + length])
+                            del buffer[:_FRAME.size + length]
+                            if ok:
+                                results[index] = value
+                            else:
+                                errors.append(f"任务{index}: {value}")
+                        continue
+                    del workers[fd]
+                    os.close(fd)
+                    _, status = os.waitpid(pid, 0)
+                    if status != 0:
+                        errors.append(f"工作进程{pid}异常退出")
+        finally:
+            for fd, (pid, _) in workers.items():
+                os.close(fd)
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+        if errors:
+            raise RuntimeError("推演失败: " + "; ".join(errors))
+        return results
+
+    def _worker_main(self, tasks, indices, write_fd):
+        """
+        工作进程：依次为分到的每个任务再fork一个推演进程
+        推演进程从工作进程（即父进程的写时复制副本）的原始状态开始，互不影响；
+        fork分散在各工作进程中进行，父进程只负责收集结果
+        """
+        status = 0
+        try:
+            for index in indices:
+                seed, prepare = tasks[index]
+                pid = os.fork()
+                if pid == 0:
+                    self._rollout_main(index, seed, prepare, write_fd)
+                _, child_status = os.waitpid(pid, 0)
+                if child_status != 0:
+                    _write_frame(write_fd, index, (False, "推演进程异常退出"))
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _rollout_main(self, index, seed, prepare, write_fd):
+        """推演进程：推演一次，写出结果后直接退出（不执行父进程的清理逻辑）"""
+        status = 0
+        try:
+            gc.disable()    # 推演进程很快退出，不需要回收循环引用
+            try:
+                value = (True, _play_out(self.game, seed, prepare, self.max_turns, self.evaluate))
+            except Exception as e:
+                value = (False, f"{type(e).__name__}: {e}")
+            _write_frame(write_fd, index, value)
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="从对局中盘并行推演，估计各座位胜率")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai", type=int, default=2, help="AI玩家数")
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--warmup-turns", type=int, default=30, help="推演前先进行的回合数")
+    parser.add_argument("--rollouts", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    args = parser.parse_args(argv)
+
+    game = play_game(args.seed, build_player_specs(0, args.ai), args.tiles, args.warmup_turns)
+    rollouts = ForkRollouts(game, args.workers, args.max_turns)
+    start = time.perf_counter()
+    results = rollouts.run(range(args.rollouts))
+    elapsed = time.perf_counter() - start
+
+    wins = [0] * len(game.players)
+    for winner, _, _ in results:
+        if winner >= 0:
+            wins[winner] += 1
+    print(f"第 {game.turn_count} 回合起推演 {len(results)} 次，用时 {elapsed:.2f}s"
+          f"（{len(results) / elapsed:.0f} 次/秒）")
+    for player, count in zip(game.players, wins):
+        print(f"  {player.name}: 胜率 {count / len(results) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""无界面批量对局
+
+用法: python -m simulation.runner --games 1000 --ai 4 --out results --format npz [--per-turn] [--economy]
+
+各局的骰子与事件由对局种子决定，地图由--board-seed决定（默认所有对局使用同一张地图）。
+大地图的布局按(地块数, 地图种子)缓存在磁盘上，每局一张地图会为每个种子写一个缓存文件。
+"""
+
+import argparse
+import time
+from managers.game_manager import GameManager, build_player_specs
+from simulation.records import RecordWriter
+from config import TOTAL_TILES
+
+# 防止双方都无法破产时对局无限进行
+DEFAULT_MAX_TURNS = 5000
+
+
+def play_game(seed=None, player_specs=None, total_tiles=TOTAL_TILES, max_turns=DEFAULT_MAX_TURNS,
+              board_seed=None, setup=None, adjudicator=None, after_turn=None, game=None):
+    """
+    由AI完成一整局游戏并返回结束时的GameManager
+    setup(game)在开局前调用，可用于注册事件监听器
+    adjudicator(game)在每回合后调用，返回玩家时判定其获胜并提前结束对局
+    after_turn(game)在对局未结束时于每回合后调用（可用于写检查点）
+    提供game时从该对局的当前状态继续（不再新建对局，也不调用setup）
+    """
+    if game is None:
+        if player_specs is None:
+            player_specs = build_player_specs(0, 2)
+        game = GameManager(total_tiles, seed, player_specs, board_seed)
+        if setup is not None:
+            setup(game)
+    while not game.game_over and game.turn_count < max_turns:
+        game.play_ai_turn()
+        if adjudicator is not None and not game.game_over:
+            winner = adjudicator(game)
+            if winner is not None:
+                game.adjudicate(winner)
+        if after_turn is not None and not game.game_over:
+            after_turn(game)
+    return game
+
+
+def run_games(seeds, writer=None, **kwargs):
+    """依次进行多局，返回完成的局数；提供writer时逐局写出记录"""
+    count = 0
+    setup = writer.attach if writer is not None else None
+    for seed in seeds:
+        game = play_game(seed, setup=setup, **kwargs)
+        if writer is not None:
+            writer.write_game(game)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无界面批量对局")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--ai", type=int, default=2, help="AI玩家数")
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--board-seed", type=int, default=0, help="地图种子（所有对局共用）")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--out", default="results")
+    parser.add_argument("--format", choices=("jsonl", "npz"), default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--per-turn", action="store_true", help="同时写出逐回合记录")
+    parser.add_argument("--economy", action="store_true", help="同时写出经济时间序列（CPI、总财富、利率与税率）")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with RecordWriter(args.out, args.format, args.chunk_size, args.per_turn, economy=args.economy) as writer:
+        count = run_games(
+            range(args.first_seed, args.first_seed + args.games),
+            writer,
+            player_specs=build_player_specs(0, args.ai),
+            total_tiles=args.tiles,
+            board_seed=args.board_seed,
+            max_turns=args.max_turns,
+        )
+    elapsed = time.perf_counter() - start
+    print(f"完成 {count} 局，用时 {elapsed:.1f}s（{count / elapsed:.1f} 局/秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""长时间浸泡测试
+
+通过GameSession连续驱动对局（结束后自动开新局）直到累计回合数达到目标，
+人类座位由随机策略从合法动作中选择。定期采样常驻内存(RSS)、Python存活内存块数、
+tracemalloc追踪内存与回合速率；每次采样后再在tracemalloc下推进几个回合，
+统计每回合分配且回合结束后仍存活的内存块数。结束时按预算判定：
+
+- 预热之后内存块数、RSS、追踪内存随回合数的增长斜率不得超过预算（泄漏）
+- 预热之后任一采样的每回合存活分配数不得超过预算
+- 最后一段的回合速率不得低于开始时的1/max_slowdown（变慢；分配统计的回合不计时）
+- 任何时刻对局未结束、轮到人类却没有合法动作，或轮到AI却无法行动，即判定卡死
+
+用法: python -m simulation.soak --turns 1000000 --ai 2 --humans 1 [--tracemalloc]
+失败时退出码为1。
+"""
+
+import argparse
+import gc
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from managers.game_manager import GameManager, build_player_specs
+from managers.game_session import GameSession
+from simulation.runner import DEFAULT_MAX_TURNS
+from config import TOTAL_TILES
+
+# 一个回合内的动作数超过该值视为卡死（正常回合只有几个动作）
+MAX_STEPS_PER_TURN = 1000
+# 每次采样统计分配的回合数；期间开了新局的统计作废重测，最多重测的次数
+ALLOC_TURNS = 20
+ALLOC_RETRIES = 5
+
+
+class StallError(Exception):
+    """对局停在无法继续的状态"""
+
+
+def current_rss():
+    """当前常驻内存（字节）；无法读取/proc时退回峰值常驻内存"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _slope(points):
+    """最小二乘斜率"""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def _describe_stall(gm, session):
+    player = gm.get_current_player()
+    waiting = [name for name in ("waiting_for_buy_decision", "waiting_for_sell_decision",
+                                 "waiting_for_upgrade_decision") if getattr(gm, name)]
+    return (f"种子{gm.seed} 第{gm.turn_count}回合 {player.name}(AI={player.is_ai}) "
+            f"等待={waiting or '无'} 状态={session.status()}")
+
+
+class SoakRunner:
+    """浸泡测试驱动"""
+
+    def __init__(self, player_specs, total_tiles=TOTAL_TILES, first_seed=0,
+                 max_turns_per_game=DEFAULT_MAX_TURNS, board_seed=0):
+        self.player_specs = player_specs
+        self.total_tiles = total_tiles
+        # 所有对局共用一张地图：大地图的布局按种子缓存在磁盘上，每局一张会为每局写一个缓存文件，
+        # 新的内存映射也会计入RSS增长
+        self.board_seed = board_seed
+        self.next_seed = first_seed
+        self.max_turns_per_game = max_turns_per_game
+        self.policy_rng = random.Random(first_seed)
+        self.games = 0
+        self.turns = 0
+        self.session = None
+        self.baseline_snapshot = None     # tracemalloc快照（预热结束时与测试结束时）
+        self.final_snapshot = None
+        self._new_game()
+
+    def _new_game(self):
+        self.session = GameSession(GameManager(self.total_tiles, self.next_seed, self.player_specs,
+                                                 self.board_seed))
+        self.next_seed += 1
+        self.games += 1
+
+    def _human_action(self):
+        session = self.session
+        actions = session.legal_actions()
+        if not actions:
+            raise StallError("轮到人类玩家但没有合法动作: " + _describe_stall(session.game_manager, session))
+        action = self.policy_rng.choice(actions)
+        if action == "sell":
+            options = session.status()["sell_options"]
+            if not options:
+                raise StallError("等待出售但没有可出售的地产: " + _describe_stall(session.game_manager, session))
+            return session.apply(action, self.policy_rng.choice(options))
+        return session.apply(action)
+
+    def play_turn(self):
+        """推进一个完整回合（对局结束时开始新局）"""
+        gm = self.session.game_manager
+        if gm.game_over or gm.turn_count >= self.max_turns_per_game:
+            self._new_game()
+            gm = self.session.game_manager
+        turn = gm.turn_count
+        for _ in range(MAX_STEPS_PER_TURN):
+            if self.session.ai_can_act():
+                self.session.step_ai()
+            elif self.session.is_human_turn():
+                self._human_action()
+            else:
+                raise StallError("对局未结束但无人可以行动: " + _describe_stall(gm, self.session))
+            if gm.turn_count != turn or gm.game_over:
+                self.turns += 1
+                return
+        raise StallError(f"一个回合内超过{MAX_STEPS_PER_TURN}个动作: " + _describe_stall(gm, self.session))
+
+    def allocations_per_turn(self, turns=ALLOC_TURNS):
+        """
+        在tracemalloc下推进turns个回合，返回平均每回合分配且仍存活的内存块数
+        （按前后快照的差计；期间开了新局时旧局的释放与新局的分配不可比，重测）
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            for _ in range(ALLOC_RETRIES):
+                games = self.games
+                gc.collect()
+                before = tracemalloc.take_snapshot()
+                for _ in range(turns):
+                    self.play_turn()
+                gc.collect()
+                after = tracemalloc.take_snapshot()
+                if self.games == games:
+                    diff = after.compare_to(before, "lineno")
+                    return sum(stat.count_diff for stat in diff if stat.count_diff > 0) / turns
+            return None
+        finally:
+            if started:
+                tracemalloc.stop()
+
+
+def run_soak(total_turns, runner, sample_every=10000, warmup_turns=50000, trace=False, report=print):
+    """
+    运行浸泡测试，返回采样列表
+    每项为 (累计回合, 耗时秒, RSS字节, 存活内存块数, 追踪内存字节, 每回合存活分配数)
+    耗时不含采样与分配统计本身；分配统计的回合计入累计回合（无法统计时为None）
+    """
+    if trace:
+        tracemalloc.start()
+    samples = []
+    start = time.perf_counter()
+    paused = 0.0
+    next_sample = runner.turns + sample_every
+    try:
+        while runner.turns < total_turns:
+            runner.play_turn()
+            if runner.turns >= next_sample:
+                next_sample += sample_every
+                elapsed = time.perf_counter() - start - paused
+                # 旧对局中玩家与地产互相引用，先回收循环引用，只统计真正存活的内存
+                gc.collect()
+                traced = tracemalloc.get_traced_memory()[0] if trace else 0
+                turns, rss, blocks = runner.turns, current_rss(), sys.getallocatedblocks()
+                if trace and len(samples) == warmup_turns // sample_every:
+                    runner.baseline_snapshot = tracemalloc.take_snapshot()
+                allocs = runner.allocations_per_turn()
+                sample = (turns, elapsed, rss, blocks, traced, allocs)
+                samples.append(sample)
+                report(f"回合 {turns:>9}  局 {runner.games:>6}  "
+                       f"RSS {rss / 2 ** 20:7.1f} MiB  内存块 {blocks:>8}  "
+                       f"每回合分配 {'-' if allocs is None else format(allocs, '.1f'):>6}"
+                       + (f"  追踪 {traced / 1024:8.1f} KiB" if trace else ""))
+                paused = time.perf_counter() - start - elapsed
+    finally:
+        if trace:
+            runner.final_snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+            tracemalloc.stop()
+    return samples
+
+
+def check_budgets(samples, warmup_turns, max_blocks_per_kturn, max_rss_kib_per_kturn,
+                  max_traced_kib_per_kturn, max_allocs_per_turn, max_slowdown):
+    """按预算检查采样结果，返回违反预算的说明列表"""
+    steady = [s for s in samples if s[0] > warmup_turns]
+    failures = []
+    if len(steady) < 3:
+        return ["预热后的采样点不足，无法判定（增加--turns或减小--warmup）"]
+
+    blocks = _slope([(s[0], s[3]) for s in steady]) * 1000
+    rss = _slope([(s[0], s[2]) for s in steady]) * 1000 / 1024
+    print(f"预热后每千回合增长: 内存块 {blocks:.2f}  RSS {rss:.2f} KiB")
+    if blocks > max_blocks_per_kturn:
+        failures.append(f"内存块每千回合增长 {blocks:.2f} 超过预算 {max_blocks_per_kturn}")
+    if rss > max_rss_kib_per_kturn:
+        failures.append(f"RSS每千回合增长 {rss:.2f} KiB 超过预算 {max_rss_kib_per_kturn} KiB")
+    if steady[0][4] or steady[-1][4]:
+        traced = _slope([(s[0], s[4]) for s in steady]) * 1000 / 1024
+        print(f"预热后每千回合增长: 追踪内存 {traced:.2f} KiB")
+        if traced > max_traced_kib_per_kturn:
+            failures.append(f"追踪内存每千回合增长 {traced:.2f} KiB 超过预算 {max_traced_kib_per_kturn} KiB")
+    allocs = [(s[0], s[5]) for s in steady if s[5] is not None]
+    if allocs:
+        turn, worst = max(allocs, key=lambda item: item[1])
+        print(f"每回合存活分配: 最大 {worst:.1f}（第{turn}回合）  平均 {sum(a for _, a in allocs) / len(allocs):.1f}")
+        if worst > max_allocs_per_turn:
+            failures.append(f"第{turn}回合起每回合存活分配 {worst:.1f} 块超过预算 {max_allocs_per_turn}")
+    else:
+        failures.append("预热后没有一次分配统计成功（每次都遇到新局）")
+
+    # 比较预热后第一段与最后一段的回合速率：每段取最快的采样间隔，
+    # 机器上其他负载造成的偶发变慢只拖慢个别间隔，真正的变慢使整段都慢
+    rates = [(b[0] - a[0]) / (b[1] - a[1]) if b[1] > a[1] else float("inf")
+             for a, b in zip(steady, steady[1:])]
+    segment = max(1, len(rates) // 4)
+    first = max(rates[:segment])
+    last = max(rates[-segment:])
+    print(f"回合速率: 开始 {first:.0f}/s  结束 {last:.0f}/s")
+    if last * max_slowdown < first:
+        failures.append(f"回合速率从 {first:.0f}/s 降到 {last:.0f}/s，超过允许的{max_slowdown}倍")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="长时间浸泡测试（内存泄漏、变慢与卡死）")
+    parser.add_argument("--turns", type=int, default=1000000)
+    parser.add_argument("--ai", type=int, default=2, help="AI玩家数")
+    parser.add_argument("--humans", type=int, default=1, help="由随机策略操作的人类座位数")
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--board-seed", type=int, default=0, help="地图种子（所有对局共用）")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS, help="单局回合上限")
+    parser.add_argument("--sample-every", type=int, default=10000)
+    parser.add_argument("--warmup", type=int, default=50000, help="不计入增长斜率的预热回合数")
+    parser.add_argument("--tracemalloc", action="store_true", help="启用tracemalloc（明显变慢）")
+    parser.add_argument("--max-blocks-per-kturn", type=float, default=5.0)
+    parser.add_argument("--max-rss-kib-per-kturn", type=float, default=16.0)
+    parser.add_argument("--max-traced-kib-per-kturn", type=float, default=1.0)
+    parser.add_argument("--max-allocs-per-turn", type=float, default=10.0,
+                        help="每回合分配且回合结束后仍存活的内存块数上限")
+    parser.add_argument("--max-slowdown", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    runner = SoakRunner(build_player_specs(args.humans, args.ai), args.tiles,
+                        args.first_seed, args.max_turns, args.board_seed)
+    try:
+        samples = run_soak(args.turns, runner, args.sample_every, args.warmup, args.tracemalloc)
+    except StallError as e:
+        print(f"失败: {e}")
+        sys.exit(1)
+
+    failures = check_budgets(samples, args.warmup, args.max_blocks_per_kturn, args.max_rss_kib_per_kturn,
+                             args.max_traced_kib_per_kturn, args.max_allocs_per_turn, args.max_slowdown)
+    if failures and runner.baseline_snapshot is not None and runner.final_snapshot is not None:
+        print("预热后增长最多的分配位置:")
+        for stat in runner.final_snapshot.compare_to(runner.baseline_snapshot, "lineno")[:10]:
+            print(f"  {stat}")
+    if failures:
+        for failure in failures:
+            print(f"失败: {failure}")
+        sys.exit(1)
+    print(f"通过: {runner.turns} 回合，{runner.games} 局")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""策略锦标赛与参数扫描
+
+用法:
+    python -m simulation.tournament default cautious aggressive --games 3000 --db results.db
+    python -m simulation.tournament default aggressive --tax-rates 0.0 0.02 0.04 --games 1000 --db results.db
+    python -m simulation.tournament default aggressive --games 5000 --stop sprt --adjudicate 8
+    python -m simulation.tournament default aggressive --tax-rates 0.0 0.02 0.04 --games 100000 \\
+        --db results.db --checkpoint sweep.ckpt.json   # 中断后以相同参数重新运行即可续跑
+"""
+
+import argparse
+import sys
+from ai.ai_player import get_strategy, load_strategies
+from managers.game_manager import GameManager
+from simulation.runner import play_game, DEFAULT_MAX_TURNS
+from simulation.checkpoint import Checkpointer, Interrupted, capture_game, resume_game
+from simulation.results_store import ResultsStore, strategy_id_of
+from simulation.sequential import STOP_RULES, WealthAdjudicator
+from config import TOTAL_TILES, INITIAL_TAX_RATE, INITIAL_INTEREST_RATE
+
+
+def make_params(strategy_ids, tax_rate=INITIAL_TAX_RATE, interest_rate=INITIAL_INTEREST_RATE,
+                total_tiles=TOTAL_TILES, board_seed=None):
+    """
+    一组对局参数（写入结果库configs表）
+    board_seed为None时每局的地图由对局种子决定，否则所有对局共用该种子的地图
+    """
+    params = {
+        "tax_rate": tax_rate,
+        "interest_rate": interest_rate,
+        "total_tiles": total_tiles,
+        "num_players": len(strategy_ids),
+    }
+    if board_seed is not None:
+        params["board_seed"] = board_seed
+    return params
+
+
+def apply_params(game, params):
+    """把对局参数应用到刚创建的GameManager"""
+    for player in game.players:
+        player.tax_rate = params["tax_rate"]
+        player.interest_rate = params["interest_rate"]
+
+
+def seating(strategy_ids, game_index):
+    """轮换座位，使每种策略在各座位上出场次数相同"""
+    shift = game_index % len(strategy_ids)
+    order = strategy_ids[shift:] + strategy_ids[:shift]
+    return [(strategy_id, True, get_strategy(strategy_id)) for strategy_id in order]
+
+
+class TournamentResult:
+    """一轮锦标赛的结果"""
+
+    def __init__(self, strategy_ids):
+        self.wins = dict.fromkeys(strategy_ids, 0)   # 策略 -> 获胜局数
+        self.games = 0                               # 实际进行的局数
+        self.turns = 0                               # 所有对局的回合总数（计算量）
+        self.decision = None                         # 停止规则的结论：获胜策略、DRAW或None
+
+    def win_rates(self):
+        return {sid: count / self.games if self.games else 0.0 for sid, count in self.wins.items()}
+
+    def to_dict(self):
+        return {"wins": self.wins, "games": self.games, "turns": self.turns, "decision": self.decision}
+
+    @classmethod
+    def from_dict(cls, data):
+        result = cls(list(data["wins"]))
+        result.wins = dict(data["wins"])
+        result.games = data["games"]
+        result.turns = data["turns"]
+        result.decision = data["decision"]
+        return result
+
+
+def run_tournament(strategy_ids, games, params=None, store=None, first_seed=0,
+                   max_turns=DEFAULT_MAX_TURNS, stop_rule=None, adjudicator=None,
+                   result=None, in_flight=None, checkpoint=None):
+    """
+    进行一轮锦标赛（最多games局），返回TournamentResult
+    提供store时逐局写入结果库；提供stop_rule时每完成一轮座位轮换检查一次，
+    得出结论即停止；adjudicator用于提前判定单局胜负（见simulation.sequential）
+    续跑时result为已完成对局的统计，in_flight为被中断对局的状态（见simulation.checkpoint）；
+    checkpoint(result, game)在每回合后与每局结束后（game为None）调用
+    """
+    strategy_ids = list(strategy_ids)
+    if params is None:
+        params = make_params(strategy_ids)
+    config_id = store.get_config_id(params) if store is not None else None
+    if result is None:
+        result = TournamentResult(strategy_ids)
+    after_turn = (lambda g: checkpoint(result, g)) if checkpoint is not None else None
+
+    for i in range(result.games, games):
+        game = None
+        if in_flight is not None:
+            game = GameManager(params["total_tiles"], first_seed + i, seating(strategy_ids, i),
+                               params.get("board_seed"))
+            resume_game(game, in_flight)
+            in_flight = None
+        game = play_game(
+            first_seed + i,
+            seating(strategy_ids, i),
+            params["total_tiles"],
+            max_turns,
+            board_seed=params.get("board_seed"),
+            setup=lambda g: apply_params(g, params),
+            adjudicator=adjudicator,
+            after_turn=after_turn,
+            game=game
+        )
+        result.games += 1
+        result.turns += game.turn_count
+        if game.winner is not None:
+            result.wins[strategy_id_of(game.winner)] += 1
+        if store is not None:
+            store.add_game(game, config_id)
+        if stop_rule is not None and (i + 1) % len(strategy_ids) == 0:
+            result.decision = stop_rule.check(result.wins)
+            if result.decision is not None:
+                break
+        if checkpoint is not None:
+            checkpoint(result, None)
+
+    if store is not None:
+        store.flush()
+    return result
+
+
+def run_sweep(strategy_ids, tax_rates, games_per_point, store=None, first_seed=0,
+              max_turns=DEFAULT_MAX_TURNS, stop_rule=None, adjudicator=None, checkpointer=None,
+              total_tiles=TOTAL_TILES, board_seed=None):
+    """
+    按税率逐点进行锦标赛，返回 {税率: TournamentResult}
+    提供checkpointer时从已有检查点续跑，并定期写检查点；
+    收到停止信号时写出检查点后抛出Interrupted
+    """
+    done, current, in_flight = [], None, None
+    saved = checkpointer.load() if checkpointer is not None else None
+    if saved is not None:
+        done = [TournamentResult.from_dict(data) for data in saved["done"]]
+        current = TournamentResult.from_dict(saved["current"]) if saved["current"] else None
+        in_flight = saved["in_flight"]
+        if store is not None and saved["store_next_id"] is not None:
+            store.rollback_to(saved["store_next_id"])
+
+    def save(result, game):
+        # 先提交结果库，检查点中记录的对局ID之前的结果都已落盘
+        if store is not None:
+            store.flush()
+        checkpointer.save({
+            "done": [r.to_dict() for r in done],
+            "current": result.to_dict() if result is not None else None,
+            "in_flight": capture_game(game) if game is not None else None,
+            "store_next_id": store.next_game_id if store is not None else None,
+        })
+
+    def checkpoint(result, game):
+        if checkpointer.due():
+            save(result, game)
+            if checkpointer.stop_requested:
+                raise Interrupted()
+
+    for point, tax_rate in enumerate(tax_rates):
+        if point < len(done):
+            continue
+        params = make_params(strategy_ids, tax_rate=tax_rate, total_tiles=total_tiles, board_seed=board_seed)
+        done.append(run_tournament(
+            strategy_ids, games_per_point, params, store, first_seed, max_turns,
+            stop_rule, adjudicator, current, in_flight,
+            checkpoint if checkpointer is not None else None
+        ))
+        current, in_flight = None, None
+    if checkpointer is not None:
+        save(None, None)
+    return dict(zip(tax_rates, done))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="策略锦标赛与参数扫描")
+    parser.add_argument("strategies", nargs="+")
+    parser.add_argument("--games", type=int, default=1000, help="每个参数点的局数")
+    parser.add_argument("--tax-rates", type=float, nargs="*", default=[INITIAL_TAX_RATE])
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--board-seed", type=int, default=0, help="地图种子（所有对局共用）")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--db", help="结果库路径（SQLite）")
+    parser.add_argument("--stop", choices=sorted(STOP_RULES), help="序贯停止规则（得出结论即停止）")
+    parser.add_argument("--adjudicate", type=float, metavar="RATIO",
+                        help="领先者财富达到第二名的RATIO倍时提前判定胜负")
+    parser.add_argument("--load", metavar="PATH", action="append", default=[],
+                        help="先登记策略文件中的策略（simulation.evolve的输出），可重复指定")
+    parser.add_argument("--checkpoint", help="检查点文件（存在时从中续跑）")
+    parser.add_argument("--checkpoint-interval", type=float, default=60.0, help="写检查点的间隔秒数")
+    args = parser.parse_args(argv)
+
+    for path in args.load:
+        load_strategies(path)
+    adjudicator = WealthAdjudicator(args.adjudicate) if args.adjudicate else None
+    checkpointer = None
+    if args.checkpoint:
+        run = {key: getattr(args, key) for key in
+               ("strategies", "games", "tax_rates", "first_seed", "tiles", "board_seed",
+                "max_turns", "stop", "adjudicate")}
+        checkpointer = Checkpointer(args.checkpoint, run, args.checkpoint_interval)
+        checkpointer.handle_signals()
+    store = ResultsStore(args.db) if args.db else None
+    try:
+        stop_rule = STOP_RULES[args.stop]() if args.stop else None
+        results = run_sweep(args.strategies, args.tax_rates, args.games, store,
+                            args.first_seed, args.max_turns, stop_rule, adjudicator, checkpointer,
+                            args.tiles, args.board_seed)
+    except Interrupted:
+        print(f"已中断，检查点已写入 {args.checkpoint}，以相同参数重新运行即可续跑")
+        sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
+
+    for tax_rate, result in results.items():
+        summary = "  ".join(f"{sid}: {rate * 100:.1f}%" for sid, rate in result.win_rates().items())
+        decision = f"  结论: {result.decision}" if result.decision is not None else ""
+        print(f"税率 {tax_rate * 100:.2f}%  {summary}  ({result.games} 局, {result.turns} 回合){decision}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""后台估计各玩家胜率
+
+每当对局进入新的回合，把当前状态（对局描述与状态快照）分批交给后台工作进程，
+推演到结束（或推演horizon回合后按财富领先者计），逐批累积，估计逐步细化。
+状态改变时新任务立即发给所有工作进程：工作进程每次推演前检查管道，
+发现新任务就放弃当前批次，旧状态的计算最多浪费一次推演。
+当前状态至少完成一批之前不因回合推进而重新开始：AI高速对战时回合推进快于一批推演，
+每次都重新开始就永远得不到结果；此时估计按批次的节奏更新，对应的回合数略为滞后。
+回合中途（等待决策、已投骰未结束回合）的状态不能保存，等到回合之间再开始。
+
+界面每帧调用poll()：只用非阻塞的管道读写收取结果、派发批次，界面进程中没有后台线程，
+不会与渲染争抢GIL。estimate始终是最近一次完成的估计，
+状态刚改变时仍保留上一回合的估计直到新结果到达。
+"""
+
+import multiprocessing
+import os
+from managers import game_state
+from simulation.checkpoint import capture_game, resume_game
+from config import WIN_ESTIMATE_ROLLOUTS, WIN_ESTIMATE_BATCH, WIN_ESTIMATE_HORIZON
+
+
+def _worker(conn):
+    """工作进程：接收 (批次号, 对局描述, 状态, 种子列表, 推演回合数)，回复 (批次号, 各座位获胜次数)"""
+    if hasattr(os, "nice"):
+        os.nice(10)   # 降低优先级，CPU不足时让出给界面进程
+    cached = None     # 最近一局重建的 (对局描述, GameManager)，同一局的批次不重复构建地图
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if task is None:
+            return
+        batch_id, description, data, seeds, horizon = task
+        if cached is None or cached[0] != description:
+            cached = (description, game_state.build_game(description))
+        game = cached[1]
+        wins = [0] * len(game.players)
+        for seed in seeds:
+            if conn.poll():
+                break         # 状态已改变，放弃本批
+            wins[rollout(game, data, seed, horizon)] += 1
+        else:
+            conn.send((batch_id, wins))
+
+
+def rollout(game, data, seed, horizon):
+    """
+    把game重置为capture_game的状态data，以seed推演到结束或horizon回合后，返回获胜座位
+    （未结束时取财富领先者）。同一game反复推演时，每次的结果与在新建对局上推演相同
+    """
+    # 快照之外的状态逐项重置，上一次推演留下的回合内状态、待同步地块、判定标记都不带入
+    resume_game(game, data)       # 含reset_turn_state
+    game.dirty_tiles.clear()
+    game.adjudicated = False
+    game.reseed(seed)
+    for player in game.players:
+        player.is_ai = True       # 推演中所有座位都由AI策略决策
+    end_turn = game.turn_count + horizon
+    while not game.game_over and game.turn_count < end_turn:
+        game.play_ai_turn()
+    if game.winner is not None:
+        return game.winner.seat
+    return max((p for p in game.players if p.alive), key=lambda p: p.get_total_wealth()).seat
+
+
+class WinEstimator:
+    """后台胜率估计"""
+
+    def __init__(self, workers=None, rollouts=WIN_ESTIMATE_ROLLOUTS, batch=WIN_ESTIMATE_BATCH,
+                 horizon=WIN_ESTIMATE_HORIZON):
+        if workers is None:
+            workers = max(1, min(2, (os.cpu_count() or 1) - 1))   # 至少留一个核给界面
+        self.rollouts = rollouts
+        self.batch = batch
+        self.horizon = horizon
+        self.estimate = None       # 最近一次完成的估计: (各座位胜率, 推演次数, 回合数)
+
+        # spawn启动的工作进程不继承界面进程的窗口与pygame状态
+        context = multiprocessing.get_context("spawn")
+        self.processes = []
+        self.conns = []
+        for _ in range(workers):
+            conn, child_conn = context.Pipe()
+            process = context.Process(target=_worker, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self.processes.append(process)
+            self.conns.append(conn)
+        self._last_sent = [None] * workers     # 每个工作进程最近派发的批次号（收到其回复前视为忙）
+
+        self._key = None           # 正在估计的状态（game对象与回合数）
+        self._task = None          # (对局描述, 状态)
+        self._first_batch = 0      # 当前状态的第一个批次号，更早的批次结果丢弃
+        self._next_batch = 0
+        self._wins = None
+        self._done = 0
+        self._turn = 0
+
+    def poll(self, game, mid_turn=False):
+        """
+        收取已完成的批次并派发新批次（不阻塞）
+        mid_turn: 当前玩家本回合已投骰但未结束回合（GameSession.action_taken）
+        """
+        key = (id(game), game.turn_count)
+        if key != self._key and self._can_restart(game, key, mid_turn):
+            self._restart(game, key)
+
+        for worker, conn in enumerate(self.conns):
+            while conn.poll():
+                batch_id, wins = conn.recv()
+                if batch_id == self._last_sent[worker]:
+                    self._last_sent[worker] = None
+                if batch_id >= self._first_batch:
+                    for seat, count in enumerate(wins):
+                        self._wins[seat] += count
+                    self._done += self.batch
+                    self.estimate = ([w / self._done for w in self._wins], self._done, self._turn)
+            if self._last_sent[worker] is None:
+                self._dispatch(worker)
+
+    def _dispatch(self, worker):
+        submitted = (self._next_batch - self._first_batch) * self.batch
+        if self._task is None or submitted >= self.rollouts:
+            return
+        batch_id = self._next_batch
+        self._next_batch += 1
+        seeds = range(batch_id * self.batch, (batch_id + 1) * self.batch)
+        self.conns[worker].send((batch_id, *self._task, seeds, self.horizon))
+        self._last_sent[worker] = batch_id
+
+    def _can_restart(self, game, key, mid_turn):
+        if game.game_over:
+            return True            # 对局结束时直接给出结果
+        if mid_turn or game.in_turn_state():
+            return False           # 回合中途的状态不能保存
+        if self._key is None or self._key[0] != key[0] or self._task is None:
+            return True            # 换了一局或尚无进行中的估计
+        return self._done > 0      # 当前状态至少完成一批后才换到新回合
+
+    def _restart(self, game, key):
+        if self._key is None or self._key[0] != key[0]:
+            self.estimate = None   # 换了一局，旧估计不再适用
+        self._key = key
+        self._first_batch = self._next_batch
+        self._wins = [0] * len(game.players)
+        self._done = 0
+        self._turn = game.turn_count
+        if game.game_over:
+            # 对局已结束，直接给出结果
+            self._task = None
+            self.estimate = ([float(game.winner is player) for player in game.players], 0, game.turn_count)
+            return
+        self._task = (game_state.describe_game(game), capture_game(game))
+        # 忙碌的工作进程也立即收到新任务，并因此放弃旧批次
+        for worker in range(len(self.conns)):
+            self._dispatch(worker)
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""经济时间序列测试"""
+
+import numpy as np
+from simulation.economy import EconomyTracker
+from simulation.runner import play_game
+
+SPECS = [("A", True), ("B", True), ("C", True)]
+
+
+def test_one_row_per_turn_with_current_wealth():
+    def adjudicator(game):
+        return game.players[1] if game.turn_count == 120 and game.players[1].alive else None
+
+    for seed in range(12):
+        trackers = []
+        expected = []
+
+        def setup(game):
+            trackers.append(EconomyTracker(game, window=20))
+
+            def check(game, event_type, data):
+                # 复用的last_total_wealth与重新计算的总财富一致
+                if event_type == "cpi_update":
+                    expected.append(game.get_total_game_wealth())
+                    assert data["wealth"] == expected[-1]
+
+            game.add_listener(check)
+
+        game = play_game(seed, SPECS, setup=setup, adjudicator=adjudicator if seed % 2 else None)
+        tracker = trackers[0]
+        # 开局一行，之后每回合一行（包括结束对局的回合）
+        assert np.array_equal(tracker.series("turn"), np.arange(game.turn_count + 1))
+        wealth = tracker.series("total_wealth")
+        assert np.array_equal(wealth[1:1 + len(expected)], expected)
+        assert wealth[-1] == game.get_total_game_wealth()
+        assert np.isclose(tracker.series("cpi")[-1], game.cpi)
+
+        window = wealth[-20:]
+        stats = tracker.rolling["total_wealth"]
+        assert np.isclose(stats.mean, window.mean())
+        assert np.isclose(stats.variance, window.var(), rtol=1e-6, atol=1e-3)
+        assert stats.min == window.min() and stats.max == window.max()
+
+
+def test_tracker_without_rolling_stats():
+    trackers = []
+    game = play_game(0, SPECS, setup=lambda game: trackers.append(EconomyTracker(game, window=None)))
+    assert trackers[0].rolling == {}
+    assert trackers[0].length == game.turn_count + 1
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""策略进化测试"""
+
+import json
+from ai.ai_player import BUILTIN_STRATEGIES, STRATEGIES, get_strategy, load_strategies
+from simulation.evolve import Evolution
+
+
+def test_initial_population_ignores_loaded_strategies_unless_requested(tmp_path):
+    path = tmp_path / "strategies.json"
+    params = {"buy_probability": 0.123, "cash_reserve": 4567.0,
+              "upgrade_probability": 0.89, "sell_cheapest_first": False}
+    path.write_text(json.dumps({"strategies": [{"strategy_id": "evo-test", "params": params}]}))
+    load_strategies(str(path))
+    try:
+        builtin = [get_strategy(name).params() for name in BUILTIN_STRATEGIES]
+        evolution = Evolution(["default"], population=len(builtin) + 2, workers=1)
+        evolution.close()
+        assert evolution.population[:len(builtin)] == builtin
+        assert params not in evolution.population
+
+        evolution = Evolution(["default"], population=2, workers=1,
+                              seed_strategies=["evo-test", *BUILTIN_STRATEGIES])
+        evolution.close()
+        assert evolution.population == [params, builtin[0]]
+    finally:
+        del STRATEGIES["evo-test"]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""GameManager回合流程测试"""
+
+from managers.game_manager import GameManager
+from simulation.runner import play_game
+
+
+def test_no_stale_process_result_after_ai_turn():
+    # AI卖地付租后缓存的事件结果曾留到下一位玩家，使其跳过所到地块
+    checked = 0
+
+    def after_turn(game):
+        nonlocal checked
+        assert game.cached_process_result is None
+        assert game.post_payment_action is None
+        checked += 1
+
+    for seed in range(100):
+        play_game(seed, after_turn=after_turn)
+    assert checked > 0
+
+
+def test_next_turn_clears_turn_local_state():
+    game = GameManager(20, 0, [("A", True), ("B", True)])
+    game.cached_process_result = "end_turn"
+    game.post_payment_action = "end_turn"
+    game.next_turn()
+    assert game.cached_process_result is None
+    assert game.post_payment_action is None
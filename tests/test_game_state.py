@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""对局状态描述与重建测试"""
+
+import numpy as np
+from managers import board_manager, game_state
+from managers.game_manager import GameManager
+from config import LAYOUT_CACHE_MIN_TILES
+
+SPECS = [("A", True), ("B", True)]
+
+
+def test_build_game_reuses_layout_without_writing_cache(tmp_path, monkeypatch):
+    # 重建的对局直接使用描述中的地块类型，不为对局种子生成或缓存布局
+    monkeypatch.setattr(board_manager, "LAYOUT_CACHE_DIR", str(tmp_path))
+    game = GameManager(LAYOUT_CACHE_MIN_TILES, 7, SPECS, board_seed=0)
+    written = sorted(path.name for path in tmp_path.iterdir())
+
+    copy = game_state.build_game(game_state.describe_game(game))
+    assert np.array_equal(copy.board.tile_types, game.board.tile_types)
+    assert sorted(path.name for path in tmp_path.iterdir()) == written
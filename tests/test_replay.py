@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""对局录像测试"""
+
+from managers import game_state
+from simulation.replay import ReplayRecorder
+from simulation.runner import play_game
+
+SPECS = [("A", True), ("B", True), ("C", True)]
+
+
+def _check_replay(game, recorder):
+    replay = recorder.to_replay()
+    assert replay.total_turns == game.turn_count
+    assert replay.seek(replay.total_turns) == game_state.snapshot(game)
+    # 从关键帧跳转与逐回合应用差量结果相同
+    assert replay.seek(replay.total_turns, replay.seek(0), 0) == game_state.snapshot(game)
+
+
+def test_replay_ends_with_final_state():
+    for seed in range(20):
+        recorder = ReplayRecorder(interval=7)
+        game = play_game(seed, SPECS, setup=recorder.attach)
+        assert game.game_over
+        _check_replay(game, recorder)
+
+
+def test_replay_ends_with_adjudicated_state():
+    # 判定结束的对局没有turn_end事件
+    def adjudicator(game):
+        return game.players[0] if game.turn_count == 50 and game.players[0].alive else None
+
+    for seed in range(5):
+        recorder = ReplayRecorder(interval=5)
+        game = play_game(seed, SPECS, setup=recorder.attach, adjudicator=adjudicator)
+        assert game.adjudicated
+        _check_replay(game, recorder)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""模拟结果库测试"""
+
+from ai.ai_player import get_strategy
+from simulation.results_store import ResultsStore
+from simulation.runner import play_game
+
+
+def _play(seed):
+    default = get_strategy("default")
+    specs = [("A", True, default), ("B", True, default), ("C", True, get_strategy("aggressive"))]
+    return play_game(seed, specs)
+
+
+def test_strategy_in_several_seats_counts_each_game_once(tmp_path):
+    games = [_play(seed) for seed in range(8)]
+    with ResultsStore(str(tmp_path / "results.db"), batch_size=3) as store:
+        config_id = store.get_config_id({"num_players": 3})
+        for game in games:
+            store.add_game(game, config_id)
+        store.flush()
+        wins, count = store.win_rate("default")
+        assert count == len(games)
+        assert wins == sum(game.winner is not None and game.winner.seat in (0, 1) for game in games)
+        aggressive_wins, aggressive_count = store.win_rate("aggressive")
+        assert aggressive_count == len(games)
+        assert wins + aggressive_wins == sum(game.winner is not None for game in games)
+
+        # 撤销后几局时按同样的口径扣回
+        store.rollback_to(6)
+        assert store.win_rate("default")[1] == 5
+        assert store.win_rate("aggressive")[1] == 5
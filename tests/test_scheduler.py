@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""AI行动调度器测试"""
+
+from ui.scheduler import StepScheduler
+
+
+def _count(scheduler, dt):
+    return sum(1 for _ in scheduler.steps(dt))
+
+
+def test_steps_follow_elapsed_time():
+    scheduler = StepScheduler(interval=0.5, speed=1, max_backlog=1.0)
+    assert _count(scheduler, 1.25) == 2
+    # 余下的0.25秒留到下一帧
+    assert _count(scheduler, 0.25) == 1
+    assert _count(scheduler, 0.25) == 0
+
+
+def test_backlog_is_capped_after_long_frame():
+    scheduler = StepScheduler(interval=1.0, speed=4, max_backlog=0.5)
+    # 一帧10秒按节拍应有40步，只追赶一步加0.5秒的积压
+    assert _count(scheduler, 10.0) == 3
+    assert _count(scheduler, 0.0) == 0
+
+
+def test_reset_discards_time_waiting_for_human():
+    scheduler = StepScheduler(interval=0.5, speed=1)
+    assert _count(scheduler, 0.375) == 0
+    scheduler.reset()
+    assert _count(scheduler, 0.25) == 0
+    assert _count(scheduler, 0.25) == 1
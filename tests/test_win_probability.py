@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""胜率估计测试"""
+
+import time
+from managers import game_state
+from managers.game_manager import GameManager
+from simulation.checkpoint import capture_game
+from simulation.runner import play_game
+from simulation.win_probability import WinEstimator, rollout
+
+SPECS = [("A", True), ("B", True), ("C", True)]
+
+
+def test_reused_rollout_game_matches_fresh_game():
+    # 工作进程在同一个GameManager上反复推演，上一次推演的状态不能影响下一次
+    states = []
+    for seed in range(6):
+        def after_turn(game):
+            if game.turn_count % 40 == 0:
+                states.append((game_state.describe_game(game), capture_game(game)))
+
+        play_game(seed, SPECS, after_turn=after_turn)
+    assert states
+
+    reused = {}
+    for description, data in states:
+        game = reused.setdefault(description["seed"], game_state.build_game(description))
+        # 不同的推演长度使上一次推演停在各种回合之后
+        for horizon in range(1, 40, 3):
+            fresh = game_state.build_game(description)
+            assert rollout(game, data, horizon, horizon) == rollout(fresh, data, horizon, horizon)
+            assert game_state.snapshot(game) == game_state.snapshot(fresh)
+
+
+def test_estimate_arrives_while_turns_advance_quickly():
+    # 回合推进快于一批推演时不能每回合都重新开始，否则永远没有结果
+    estimator = WinEstimator(workers=1, rollouts=16, batch=4, horizon=500)
+    try:
+        game = GameManager(seed=3, player_specs=SPECS)
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if not game.game_over:
+                game.play_ai_turn()
+            estimator.poll(game)
+            if estimator.estimate is not None and estimator.estimate[1] > 0:
+                break
+            time.sleep(0.001)
+        assert estimator.estimate is not None and estimator.estimate[1] > 0
+    finally:
+        estimator.close()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""局面哈希测试"""
+
+from managers import game_state, zobrist
+from managers.game_manager import GameManager
+from managers.state_sync import StateSync, apply_changes
+
+SPECS = [("A", True), ("B", True), ("C", True)]
+
+
+def test_incremental_hash_matches_full_hash():
+    for seed in range(30):
+        game = GameManager(seed=seed, player_specs=SPECS)
+        game.enable_hashing()
+        while not game.game_over and game.turn_count < 1000:
+            game.play_ai_turn()
+            assert game.state_hash() == zobrist.full_hash(game), (seed, game.turn_count)
+
+
+def test_hash_survives_restore_and_delta_sync():
+    game = GameManager(seed=3, player_specs=SPECS)
+    game.enable_hashing()
+    sync = StateSync(game)
+    mirror = game_state.build_game(game_state.describe_game(game))
+    mirror.enable_hashing()
+    game_state.restore(mirror, sync.full_snapshot()["state"])
+    while not game.game_over and game.turn_count < 300:
+        game.play_ai_turn()
+        delta = sync.collect()
+        if delta is not None:
+            apply_changes(mirror, delta)
+        assert mirror.state_hash() == game.state_hash()
+
+    copy = GameManager(seed=3, player_specs=SPECS)
+    copy.enable_hashing()
+    game_state.restore(copy, game_state.snapshot(game))
+    assert copy.state_hash() == game.state_hash()
+
+
+def test_hashing_is_off_by_default():
+    game = GameManager(seed=1, player_specs=SPECS)
+    for _ in range(50):
+        game.play_ai_turn()
+    assert game.tile_hashes == {}
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""地图视图相机（平移与缩放）"""
+
+from config import *
+
+
+class Camera:
+    """
+    相机
+    将世界坐标中的center映射到屏幕上的anchor点，zoom为1时与原固定布局一致
+    """
+
+    def __init__(self, viewport, anchor=(BOARD_CENTER_X, BOARD_CENTER_Y)):
+        self.viewport = viewport  # 地图绘制区域 (x, y, 宽, 高)
+        self.anchor = anchor
+        self.reset()
+
+    def reset(self):
+        """恢复默认视图"""
+        self.center_x = BOARD_CENTER_X
+        self.center_y = BOARD_CENTER_Y
+        self.zoom = 1.0
+
+    def world_to_screen(self, x, y):
+        """世界坐标转屏幕坐标"""
+        return (
+            self.anchor[0] + (x - self.center_x) * self.zoom,
+            self.anchor[1] + (y - self.center_y) * self.zoom
+        )
+
+    def screen_to_world(self, x, y):
+        """屏幕坐标转世界坐标"""
+        return (
+            self.center_x + (x - self.anchor[0]) / self.zoom,
+            self.center_y + (y - self.anchor[1]) / self.zoom
+        )
+
+    def pan(self, dx, dy):
+        """按屏幕像素平移"""
+        self.center_x -= dx / self.zoom
+        self.center_y -= dy / self.zoom
+
+    def zoom_at(self, factor, screen_pos):
+        """以屏幕上某点为中心缩放，该点下的世界坐标保持不动"""
+        world_x, world_y = self.screen_to_world(*screen_pos)
+        self.zoom = max(CAMERA_MIN_ZOOM, min(self.zoom * factor, CAMERA_MAX_ZOOM))
+        new_x, new_y = self.screen_to_world(*screen_pos)
+        self.center_x += world_x - new_x
+        self.center_y += world_y - new_y
+
+    def visible_world_rect(self, margin=0):
+        """返回视口覆盖的世界坐标矩形 (x0, y0, x1, y1)，margin为世界坐标外扩量"""
+        vx, vy, vw, vh = self.viewport
+        x0, y0 = self.screen_to_world(vx, vy)
+        x1, y1 = self.screen_to_world(vx + vw, vy + vh)
+        return (x0 - margin, y0 - margin, x1 + margin, y1 + margin)
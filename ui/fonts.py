@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""字体加载
+
+pygame.font.SysFont首次调用会扫描系统字体（Linux上运行fc-list），启动明显变慢。
+这里把按FONT_NAMES解析出的字体文件路径缓存到磁盘，之后直接按路径加载；
+字体文件被删除或FONT_NAMES改变时重新解析。安装新字体后可删除缓存文件。
+窗口程序的入口用init_display()初始化pygame。
+"""
+
+import json
+import os
+import pygame
+from config import FONT_NAMES, FONT_CACHE_PATH
+
+_font_path = None
+_resolved = False
+
+
+def _read_cache():
+    try:
+        with open(FONT_CACHE_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False, None
+    path = data.get("path")
+    if data.get("names") != FONT_NAMES or (path is not None and not os.path.exists(path)):
+        return False, None
+    return True, path
+
+
+def _write_cache(path):
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{FONT_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"names": FONT_NAMES, "path": path}, f, ensure_ascii=False)
+        os.replace(tmp_path, FONT_CACHE_PATH)
+    except OSError:
+        pass  # 缓存只是加速，写入失败不影响运行
+
+
+def init_display():
+    """只初始化显示与字体模块（pygame.init会初始化音频、手柄等全部子系统，启动更慢）"""
+    pygame.display.init()
+    pygame.font.init()
+
+
+def resolve_font_path():
+    """返回中文字体文件路径，找不到匹配字体时返回None（使用pygame默认字体）"""
+    global _font_path, _resolved
+    if not _resolved:
+        found, path = _read_cache()
+        if not found:
+            path = pygame.font.match_font(FONT_NAMES)
+            _write_cache(path)
+        _font_path, _resolved = path, True
+    return _font_path
+
+
+def load_font(size):
+    """加载指定字号的字体，失败时退回默认字体"""
+    try:
+        return pygame.font.Font(resolve_font_path(), size)
+    except (OSError, pygame.error):
+        return pygame.font.Font(None, size)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""无窗口导出对局画面
+
+用真实的Renderer绘制到离屏Surface（SDL dummy驱动，不打开窗口），
+逐回合导出PNG序列或原始RGB视频流。主线程渲染下一帧的同时，
+后台线程压缩并写出上一帧（zlib压缩与文件写入期间释放GIL），速度只受编码限制。
+
+用法: python -m ui.frame_export --replay game.replay.json --out frames/
+      python -m ui.frame_export --seed 5 --ai 3 --format raw --out - \\
+          | ffmpeg -f rawvideo -pix_fmt rgb24 -s 1200x800 -r 30 -i - highlight.mp4
+"""
+
+import argparse
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from managers import game_state
+from managers.game_manager import build_player_specs
+from simulation.replay import Replay
+from simulation.runner import play_game, DEFAULT_MAX_TURNS
+from ui.renderer import Renderer
+from ui.camera import Camera
+from config import *
+
+FRAME_FORMATS = ("png", "raw")
+
+
+def encode_png(rgb, width, height, level=3):
+    """把RGB字节编码为PNG（每行使用None滤波）"""
+    rows = np.frombuffer(rgb, dtype=np.uint8).reshape(height, width * 3)
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rows
+
+    def chunk(tag, data):
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), level)) + chunk(b"IEND", b""))
+
+
+class FrameWriter:
+    """后台线程写帧；队列满时write阻塞，避免渲染远快于编码时占满内存"""
+
+    def __init__(self, out, fmt="png", max_pending=8, png_level=3):
+        if fmt not in FRAME_FORMATS:
+            raise ValueError(f"不支持的帧格式: {fmt}")
+        self.out = out
+        self.fmt = fmt
+        self.png_level = png_level
+        self.frame_count = 0
+        self._error = None
+        if fmt == "png":
+            os.makedirs(out, exist_ok=True)
+            self._stream = None
+        elif out == "-":
+            self._stream = sys.stdout.buffer
+        else:
+            self._stream = open(out, "wb")
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, surface):
+        """复制当前画面并交给后台线程编码"""
+        if self._error is not None:
+            raise self._error
+        rgb = pygame.image.tobytes(surface, "RGB")
+        self._queue.put((self.frame_count, rgb, surface.get_size()))
+        self.frame_count += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            index, rgb, (width, height) = item
+            try:
+                if self.fmt == "png":
+                    path = os.path.join(self.out, f"frame_{index:06d}.png")
+                    with open(path, "wb") as f:
+                        f.write(encode_png(rgb, width, height, self.png_level))
+                else:
+                    self._stream.write(rgb)
+            except Exception as e:  # 在主线程的下一次write或close时抛出
+                self._error = e
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self._stream is not None:
+            self._stream.flush()
+            if self._stream is not sys.stdout.buffer:
+                self._stream.close()
+        if self._error is not None:
+            raise self._error
+
+
+class FrameRenderer:
+    """离屏渲染对局画面"""
+
+    def __init__(self, zoom=1.0):
+        pygame.font.init()
+        self.surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.renderer = Renderer(self.surface)
+        self.camera = Camera((0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.camera.zoom = zoom
+
+    def render(self, game, caption=None):
+        self.surface.fill(WHITE)
+        self.renderer.draw_game_view(game, self.camera)
+        if caption:
+            self.renderer.draw_text(caption, (50, WINDOW_HEIGHT - 46), BLACK, self.renderer.small_font)
+        return self.surface
+
+
+def export_replay(replay, writer, frame_renderer, start=0, end=None, step=1):
+    """导出录像中[start, end]回合的画面，每step回合一帧"""
+    end = replay.total_turns if end is None else min(end, replay.total_turns)
+    game = game_state.build_game(replay.game_info)
+    state, shown = None, None
+    for turn in range(max(0, start), end + 1, step):
+        state = replay.seek(turn, state, shown)
+        shown = turn
+        game_state.restore(game, state)
+        writer.write(frame_renderer.render(game, f"回合 {turn}/{replay.total_turns}"))
+
+
+def export_live(writer, frame_renderer, step=1, **game_kwargs):
+    """运行一局AI对局，每step回合导出一帧（含开局与结束画面）"""
+    def on_event(game, event_type, data):
+        if event_type == "turn_end" and data["turn"] % step == 0:
+            writer.write(frame_renderer.render(game, f"回合 {data['turn']}"))
+
+    def setup(game):
+        writer.write(frame_renderer.render(game, "回合 0"))
+        game.add_listener(on_event)
+
+    game = play_game(setup=setup, **game_kwargs)
+    writer.write(frame_renderer.render(game, f"回合 {game.turn_count}"))
+    return game
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无窗口导出对局画面")
+    parser.add_argument("--replay", help="录像文件（不指定时现场运行一局AI对局）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai", type=int, default=2, help="AI玩家数")
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--start", type=int, default=0, help="录像的起始回合")
+    parser.add_argument("--end", type=int, help="录像的结束回合")
+    parser.add_argument("--step", type=int, default=1, help="每隔多少回合导出一帧")
+    parser.add_argument("--zoom", type=float, default=1.0)
+    parser.add_argument("--format", choices=FRAME_FORMATS, default="png")
+    parser.add_argument("--png-level", type=int, default=3, help="PNG压缩级别0-9")
+    parser.add_argument("--out", default="frames", help="PNG输出目录，或raw输出文件（-为标准输出）")
+    args = parser.parse_args(argv)
+
+    writer = FrameWriter(args.out, args.format, png_level=args.png_level)
+    frame_renderer = FrameRenderer(args.zoom)
+    start = time.perf_counter()
+    try:
+        if args.replay:
+            export_replay(Replay.load(args.replay), writer, frame_renderer, args.start, args.end, args.step)
+        else:
+            export_live(writer, frame_renderer, args.step, seed=args.seed,
+                        player_specs=build_player_specs(0, args.ai),
+                        total_tiles=args.tiles, max_turns=args.max_turns)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"已导出 {writer.frame_count} 帧 ({WINDOW_WIDTH}x{WINDOW_HEIGHT})，"
+          f"耗时 {elapsed:.1f}s，{writer.frame_count / elapsed:.0f} 帧/秒", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 """游戏渲染器"""
 
+import math
 import pygame
+from models.tile import get_tile_type_color
+from managers.board_manager import TILE_TYPE_CODES
+from ui.spatial_index import SpatialGrid
+from ui.fonts import load_font
+from ui.tile_atlas import TileAtlas
 from config import *
 
 
@@ -10,44 +16,106 @@ class Renderer:
     
     def __init__(self, screen):
         self.screen = screen
-        # 使用系统字体支持中文显示
-        # 优先使用微软雅黑，如果没有则尝试其他中文字体
-        try:
-            self.font = pygame.font.SysFont('microsoftyahei,simsun,simhei,arial', 24)
-            self.large_font = pygame.font.SysFont('microsoftyahei,simsun,simhei,arial', 36)
-            self.small_font = pygame.font.SysFont('microsoftyahei,simsun,simhei,arial', 20)
-        except:
-            # 如果系统字体加载失败，使用默认字体
-            self.font = pygame.font.Font(None, 24)
-            self.large_font = pygame.font.Font(None, 36)
-            self.small_font = pygame.font.Font(None, 20)
+        # 使用系统字体支持中文显示（优先微软雅黑，其次其他中文字体，失败时使用默认字体）
+        self.font = load_font(24)
+        self.large_font = load_font(36)
+        self.small_font = load_font(20)
+        # 预渲染的地块贴图
+        self.atlas = TileAtlas(self.small_font)
+        # 按地块总数缓存的空间索引（同尺寸地图共享坐标）
+        self.spatial_grids = {}
         
     def draw_tile(self, tile):
         """绘制地块"""
         x, y = tile.position
-        color = tile.get_color()
-        
-        # 绘制方形地块
-        rect = pygame.Rect(x - TILE_SIZE//2, y - TILE_SIZE//2, TILE_SIZE, TILE_SIZE)
-        pygame.draw.rect(self.screen, color, rect)
-        pygame.draw.rect(self.screen, BLACK, rect, 2)
-        
-        # 绘制地块编号
-        text = self.small_font.render(str(tile.index), True, BLACK)
-        text_rect = text.get_rect(center=(x, y))
-        self.screen.blit(text, text_rect)
-        
-        # 如果有地产，绘制等级信息
-        if tile.property and tile.property.owner:
-            level_text = self.small_font.render(f"Lv{tile.property.level}", True, (100, 100, 100))
-            level_rect = level_text.get_rect(center=(x, y + 8))
-            self.screen.blit(level_text, level_rect)
+        level = tile.property.level if tile.property and tile.property.owner else None
+        self._draw_tile_at(x, y, TILE_SIZE, tile.get_color(), tile.index, level, True)
+
+    def _draw_tile_at(self, x, y, size, color, index, level, draw_text):
+        # 地块底图与文字均取自贴图缓存
+        self.screen.blits(self.atlas.tile_blits(x, y, size, color, index, level, draw_text), False)
+
+    def _get_spatial_grid(self, board):
+        grid = self.spatial_grids.get(board.total_tiles)
+        if grid is None:
+            grid = SpatialGrid(board.positions)
+            self.spatial_grids[board.total_tiles] = grid
+        return grid
+
+    def draw_board(self, board, camera):
+        """
+        通过相机绘制地图
+        只绘制视口内的地块；屏幕上地块过密时按步长抽稀，过小时不绘制文字，
+        使每帧绘制的地块数受屏幕尺寸而非地图规模限制
+        """
+        spacing = board.tile_spacing * camera.zoom
+        stride = 1
+        if spacing < LOD_MIN_TILE_SPACING:
+            stride = math.ceil(LOD_MIN_TILE_SPACING / spacing)
+        indices = self._get_spatial_grid(board).query(
+            *camera.visible_world_rect(board.tile_size), stride=stride
+        )
+        if len(indices) == 0:
+            return
+
+        size = max(2, int(board.tile_size * camera.zoom))
+        draw_text = size >= LOD_TEXT_MIN_TILE_SIZE
+
+        positions = board.positions[indices]
+        screen_xs, screen_ys = camera.world_to_screen(positions[:, 0], positions[:, 1])
+        tile_types = board.tile_types[indices]
+        half = size / 2
+        atlas = self.atlas
+        type_colors = [get_tile_type_color(tile_type) for tile_type in TILE_TYPE_CODES]
+        blits = []
+        for index, tile_type, x, y in zip(
+                indices.tolist(), tile_types.tolist(), screen_xs.tolist(), screen_ys.tolist()):
+            # 未实例化的地块必然无主，直接按类型着色
+            tile = board.tiles.peek(index)
+            if tile is not None:
+                color = tile.get_color()
+                level = tile.property.level if tile.property and tile.property.owner else None
+            else:
+                color = type_colors[tile_type]
+                level = None
+            if draw_text:
+                blits.extend(atlas.tile_blits(x, y, size, color, index, level, True))
+            else:
+                blits.append((atlas.tile(size, color), (int(x - half), int(y - half))))
+        # 一次批量blit整张地图
+        self.screen.blits(blits, False)
+
+    def draw_game_view(self, game, camera):
+        """绘制一局游戏的观战画面（地图、玩家、信息面板、消息与结束提示），不含操作按钮"""
+        self.draw_board(game.board, camera)
+        self.draw_players(game.board, game.players, camera)
+        self.draw_info_panels(game.players, game.get_current_player(), game.cpi)
+        self.draw_messages(game.messages, 700, 50, not game.get_current_player().is_ai)
+        if game.game_over and game.winner:
+            text = f"游戏结束！{game.winner.name} 获胜！"
+            self.draw_text(text, (300, 350), RED, self.large_font)
+
+    def draw_players(self, board, players, camera):
+        """通过相机绘制存活玩家，视口外的玩家不绘制"""
+        vx, vy, vw, vh = camera.viewport
+        count = len(players)
+        radius = 12 if count <= 4 else 8
+        for player in players:
+            if not player.alive:
+                continue
+            x, y = camera.world_to_screen(*board.positions[player.position])
+            # 同一地块上的玩家按座位环绕排列，偏移以屏幕像素计（两人时为左右各15）
+            angle = math.pi + 2 * math.pi * player.seat / count
+            x += math.cos(angle) * 15
+            y += math.sin(angle) * 15
+            if vx - radius <= x <= vx + vw + radius and vy - radius <= y <= vy + vh + radius:
+                self.draw_player((x, y), player.color, player.is_ai, radius)
         
-    def draw_player(self, position, color, is_ai=False):
+    def draw_player(self, position, color, is_ai=False, radius=12):
         """绘制玩家"""
         x, y = position
-        pygame.draw.circle(self.screen, color, (int(x), int(y)), 12)
-        pygame.draw.circle(self.screen, BLACK, (int(x), int(y)), 12, 2)
+        pygame.draw.circle(self.screen, color, (int(x), int(y)), radius)
+        pygame.draw.circle(self.screen, BLACK, (int(x), int(y)), radius, 2)
         
     def draw_text(self, text, position, color=BLACK, font=None):
         """绘制文本"""
@@ -92,7 +160,7 @@ class Renderer:
             buttons.append((rect, prop.tile_index))
         return buttons
 
-    def draw_info_panel(self, player, x, y, cpi=0):
+    def draw_info_panel(self, player, x, y, cpi=0, win_rate=None):
         """绘制信息面板"""
         texts = [
             f"{player.name}",
@@ -103,10 +171,38 @@ class Renderer:
             f"土地税率: {player.tax_rate * 100:.2f}%",
             f"物价指数: {cpi * 100:.2f}%"
         ]
+        if win_rate is not None:
+            texts.append(f"胜率估计: {win_rate * 100:.0f}%")
         
         for i, text in enumerate(texts):
             self.draw_text(text, (x, y + i * 25))
     
+    def draw_info_panels(self, players, current_player, cpi, win_rates=None):
+        """
+        绘制右侧玩家信息：两人对局各一面板，多人对局为当前玩家详情 + 其余玩家简表
+        win_rates为按座位排列的胜率估计（None时不显示；多人对局显示在简表中）
+        """
+        if len(players) == 2:
+            for player, y in zip(players, (50, 250)):
+                rate = win_rates[player.seat] if win_rates is not None else None
+                self.draw_info_panel(player, INFO_PANEL_X, y, cpi, rate)
+        else:
+            self.draw_info_panel(current_player, INFO_PANEL_X, 50, cpi)
+            self.draw_player_list(players, current_player, INFO_PANEL_X, 240, win_rates=win_rates)
+
+    def draw_player_list(self, players, current_player, x, y, max_rows=8, win_rates=None):
+        """绘制多人对局的简要排行（从当前玩家起按轮转顺序，出局玩家不显示）"""
+        alive = [p for p in players if p.alive]
+        start = alive.index(current_player) if current_player in alive else 0
+        rows = (alive[start:] + alive[:start])[:max_rows]
+        for i, player in enumerate(rows):
+            text = f"{player.name}  ${player.cash}  ({len(player.properties)})"
+            if win_rates is not None:
+                text += f"  {win_rates[player.seat] * 100:.0f}%"
+            self.draw_text(text, (x, y + i * 22), player.color, self.small_font)
+        if len(alive) > max_rows:
+            self.draw_text(f"... 共{len(alive)}名玩家", (x, y + max_rows * 22), GRAY, self.small_font)
+
     def draw_property_tooltip(self, prop, cpi, x, y):
         """绘制地产信息提示"""
         if prop:
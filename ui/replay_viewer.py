@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""对局录像回放
+
+操作：空格 暂停/继续，上/下 加速/减速，左/右 单步，
+PageUp/PageDown 跳转±100回合，Home/End 跳到开头/结尾，点击进度条跳转
+"""
+
+import sys
+import pygame
+from managers import game_state
+from simulation.replay import Replay
+from ui.renderer import Renderer
+from ui.camera import Camera
+from ui.fonts import init_display
+from config import *
+
+
+class ReplayViewer:
+    """录像回放器：按播放速度推进回合，每帧只渲染最新状态（跳过中间回合）"""
+
+    def __init__(self, path):
+        init_display()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("大富翁游戏 - 回放")
+        self.clock = pygame.time.Clock()
+        self.renderer = Renderer(self.screen)
+        self.camera = Camera((0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
+
+        self.replay = Replay.load(path)
+        self.game = game_state.build_game(self.replay.game_info)
+        self.progress_bar = pygame.Rect(50, WINDOW_HEIGHT - 40, 600, 16)
+
+        self.speed = 4.0          # 回合/秒
+        self.paused = False
+        self.position = 0.0       # 播放进度（可为小数，取整后为显示的回合）
+        self.shown_turn = None
+        self.shown_state = None
+        self._show(0)
+
+    def _show(self, turn):
+        """显示第turn回合结束时的状态"""
+        turn = max(0, min(turn, self.replay.total_turns))
+        if turn == self.shown_turn:
+            return
+        self.shown_state = self.replay.seek(turn, self.shown_state, self.shown_turn)
+        self.shown_turn = turn
+        game_state.restore(self.game, self.shown_state)
+
+    def seek(self, turn):
+        self.position = float(max(0, min(turn, self.replay.total_turns)))
+        self._show(int(self.position))
+
+    def run(self):
+        running = True
+        while running:
+            dt = self.clock.tick(FPS) / 1000.0
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_key(event.key)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if self.progress_bar.collidepoint(event.pos):
+                        ratio = (event.pos[0] - self.progress_bar.x) / self.progress_bar.width
+                        self.seek(round(ratio * self.replay.total_turns))
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.camera.zoom_at(CAMERA_ZOOM_STEP ** event.y, pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                    self.camera.pan(*event.rel)
+
+            if not self.paused and self.shown_turn < self.replay.total_turns:
+                self.position = min(self.position + self.speed * dt, self.replay.total_turns)
+                self._show(int(self.position))
+
+            self.render()
+
+        pygame.quit()
+        sys.exit()
+
+    def handle_key(self, key):
+        """处理键盘操作"""
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_UP:
+            self.speed = min(self.speed * 2, REPLAY_MAX_SPEED)
+        elif key == pygame.K_DOWN:
+            self.speed = max(self.speed / 2, 0.25)
+        elif key == pygame.K_RIGHT:
+            self.seek(self.shown_turn + 1)
+        elif key == pygame.K_LEFT:
+            self.seek(self.shown_turn - 1)
+        elif key == pygame.K_PAGEUP:
+            self.seek(self.shown_turn + 100)
+        elif key == pygame.K_PAGEDOWN:
+            self.seek(self.shown_turn - 100)
+        elif key == pygame.K_HOME:
+            self.seek(0)
+        elif key == pygame.K_END:
+            self.seek(self.replay.total_turns)
+
+    def render(self):
+        """渲染当前回合"""
+        self.screen.fill(WHITE)
+        self.renderer.draw_game_view(self.game, self.camera)
+
+        # 进度条与播放信息
+        total = max(1, self.replay.total_turns)
+        pygame.draw.rect(self.screen, GRAY, self.progress_bar)
+        filled = self.progress_bar.copy()
+        filled.width = int(self.progress_bar.width * self.shown_turn / total)
+        pygame.draw.rect(self.screen, BLUE, filled)
+        status = "暂停" if self.paused else f"{self.speed:g} 回合/秒"
+        self.renderer.draw_text(
+            f"回合 {self.shown_turn}/{self.replay.total_turns}  {status}",
+            (self.progress_bar.right + 20, self.progress_bar.y - 6),
+            BLACK, self.renderer.small_font
+        )
+        pygame.display.flip()
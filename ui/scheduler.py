@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""按时间推进AI行动的调度器
+
+AI节拍以秒计而与帧率无关：1×时每AI_STEP_INTERVAL秒行动一步，10×时快十倍；
+最高速度（speed为None）每帧在时间预算内尽可能多地推进，画面只显示最新状态。
+"""
+
+import time
+from config import AI_STEP_INTERVAL, AI_MAX_SPEED_FRAME_BUDGET
+
+
+class StepScheduler:
+    """AI行动调度器"""
+
+    def __init__(self, interval=AI_STEP_INTERVAL, speed=1, max_backlog=0.25, budget=AI_MAX_SPEED_FRAME_BUDGET):
+        self.interval = interval          # 1×速度下两步之间的秒数
+        self.speed = speed                # 倍速，None为最高速度
+        self.max_backlog = max_backlog    # 卡顿后最多追赶的秒数，避免一帧内集中补上大量步数
+        self.budget = budget              # 最高速度下每帧用于推进的秒数
+        self.elapsed = 0.0
+
+    def label(self):
+        return "最高" if self.speed is None else f"{self.speed:g}×"
+
+    def reset(self):
+        """重新开始计时（例如等待人类操作期间不累积AI节拍）"""
+        self.elapsed = 0.0
+
+    def steps(self, dt):
+        """本帧应推进的各步（生成器，调用方可随时停止，例如轮到人类玩家时）"""
+        if self.speed is None:
+            deadline = time.perf_counter() + self.budget
+            while True:
+                yield
+                if time.perf_counter() >= deadline:
+                    return
+        step = self.interval / self.speed
+        self.elapsed = min(self.elapsed + dt, step + self.max_backlog)
+        while self.elapsed >= step:
+            self.elapsed -= step
+            yield
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""地块坐标的均匀网格空间索引"""
+
+import math
+import numpy as np
+
+
+class SpatialGrid:
+    """
+    均匀网格空间索引
+    按网格单元对地块索引排序，查询矩形时只需取出被覆盖行上的连续片段
+    """
+
+    MAX_CELLS_PER_SIDE = 256
+
+    def __init__(self, positions):
+        xs = positions[:, 0]
+        ys = positions[:, 1]
+        self.cells = max(1, min(self.MAX_CELLS_PER_SIDE, int(math.sqrt(len(positions)))))
+        self.min_x = float(xs.min())
+        self.min_y = float(ys.min())
+        span = max(float(xs.max()) - self.min_x, float(ys.max()) - self.min_y)
+        self.cell_size = max(span / self.cells, 1e-9)
+        self.positions = positions
+
+        cell_x = self._to_cell(xs, self.min_x)
+        cell_y = self._to_cell(ys, self.min_y)
+        cell_ids = cell_y * self.cells + cell_x
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.cell_starts = np.searchsorted(
+            cell_ids[self.order], np.arange(self.cells * self.cells + 1)
+        )
+
+    def _to_cell(self, values, origin):
+        cells = ((values - origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.cells - 1)
+
+    def query(self, x0, y0, x1, y1, stride=1):
+        """返回落在世界坐标矩形内的地块索引（升序），stride>1时只保留其整数倍索引"""
+        if x1 < self.min_x or y1 < self.min_y:
+            return np.empty(0, dtype=np.int64)
+        max_coord = self.cells * self.cell_size
+        if x0 > self.min_x + max_coord or y0 > self.min_y + max_coord:
+            return np.empty(0, dtype=np.int64)
+
+        cx0, cx1 = (int(c) for c in self._to_cell(np.array([x0, x1]), self.min_x))
+        cy0, cy1 = (int(c) for c in self._to_cell(np.array([y0, y1]), self.min_y))
+        parts = [
+            self.order[self.cell_starts[row * self.cells + cx0]:
+                       self.cell_starts[row * self.cells + cx1 + 1]]
+            for row in range(cy0, cy1 + 1)
+        ]
+        indices = np.concatenate(parts)
+        if stride > 1:
+            indices = indices[indices % stride == 0]
+
+        # 网格边缘的单元可能只部分可见，精确过滤一次
+        pos = self.positions[indices]
+        inside = (
+            (pos[:, 0] >= x0) & (pos[:, 0] <= x1)
+            & (pos[:, 1] >= y0) & (pos[:, 1] <= y1)
+        )
+        indices = indices[inside]
+        indices.sort()
+        return indices
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""多局观战墙 - 一个窗口以缩略图网格同时显示多局进行中的AI对局
+
+对局在后台工作进程中运行，每局配一个StateSync，只把增量状态经队列推送给界面；
+界面为每局维护一份镜像GameManager，只有收到增量的缩略图才重绘，
+其余格子直接复用上一帧的缩略图。所有缩略图共用同一个Renderer及其贴图缓存。
+
+用法: python -m ui.spectator_wall --boards 64 --speed 4
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import queue
+import time
+import pygame
+from managers import game_state
+from managers.game_manager import GameManager, build_player_specs
+from managers.state_sync import StateSync, apply_changes
+from simulation.runner import DEFAULT_MAX_TURNS
+from ui.renderer import Renderer
+from ui.camera import Camera
+from ui.fonts import init_display
+from config import *
+
+GAME_OVER_HOLD = 3.0    # 对局结束后保留最终画面的秒数，之后在该格开始新的一局
+
+
+def _new_game(slot, generation, args):
+    seed = args.seed + generation * args.boards + slot
+    game = GameManager(args.tiles, seed, build_player_specs(0, args.ai), args.board_seed)
+    sync = StateSync(game)
+    return game, sync, ("init", slot, game_state.describe_game(game), sync.full_snapshot())
+
+
+def _worker(slots, args, out_queue, stop_event):
+    """工作进程：按固定节拍推进负责的若干局，每个节拍把所有增量打包推送一次"""
+    games = {}
+    generations = dict.fromkeys(slots, 0)
+    finished_at = {}
+    updates = []
+    for slot in slots:
+        game, sync, message = _new_game(slot, 0, args)
+        games[slot] = (game, sync)
+        updates.append(message)
+    out_queue.put(updates)
+
+    interval = 1.0 / args.speed
+    next_tick = time.perf_counter()
+    while not stop_event.is_set():
+        next_tick += interval
+        updates = []
+        now = time.perf_counter()
+        for slot in slots:
+            game, sync = games[slot]
+            if game.game_over or game.turn_count >= args.max_turns:
+                if now - finished_at.setdefault(slot, now) >= GAME_OVER_HOLD:
+                    del finished_at[slot]
+                    generations[slot] += 1
+                    game, sync, message = _new_game(slot, generations[slot], args)
+                    games[slot] = (game, sync)
+                    updates.append(message)
+                continue
+            game.play_ai_turn()
+            delta = sync.collect()
+            if delta is not None:
+                updates.append(("delta", slot, delta))
+        if updates:
+            out_queue.put(updates)
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            stop_event.wait(delay)
+        else:
+            next_tick = time.perf_counter()   # 跟不上节拍时不累积欠账
+
+
+class BoardView:
+    """一局对局的镜像与缩略图"""
+
+    def __init__(self, rect):
+        self.rect = rect
+        self.surface = pygame.Surface(rect.size)
+        self.game = None
+        self.version = 0
+        self.dirty = True
+        self.camera = None
+
+    def reset(self, description, full):
+        self.game = game_state.build_game(description)
+        game_state.restore(self.game, full["state"])
+        self.version = full["v"]
+        self.camera = self._fit_camera(self.game.board)
+        self.dirty = True
+
+    def apply(self, delta):
+        if self.game is None or delta["v"] != self.version + 1:
+            return   # 进程内队列不会丢消息，版本不连续只可能是旧对局残留的增量
+        apply_changes(self.game, delta)
+        self.version = delta["v"]
+        self.dirty = True
+
+    def _fit_camera(self, board):
+        """让整张地图恰好装进缩略图"""
+        width, height = self.rect.size
+        positions = board.positions
+        x0, y0 = positions.min(axis=0)
+        x1, y1 = positions.max(axis=0)
+        margin = board.tile_size
+        camera = Camera((0, 0, width, height), anchor=(width / 2, height / 2))
+        camera.center_x = (x0 + x1) / 2
+        camera.center_y = (y0 + y1) / 2
+        camera.zoom = min(width / (x1 - x0 + 2 * margin), height / (y1 - y0 + 2 * margin))
+        return camera
+
+    def redraw(self, renderer):
+        """重绘缩略图（共用renderer及其贴图缓存）"""
+        self.surface.fill(WHITE)
+        renderer.screen = self.surface
+        game = self.game
+        renderer.draw_board(game.board, self.camera)
+
+        # 缩略图上的玩家只画小圆点
+        radius = max(2, int(self.rect.width / 60))
+        positions = game.board.positions
+        count = len(game.players)
+        for player in game.players:
+            if not player.alive:
+                continue
+            x, y = self.camera.world_to_screen(*positions[player.position])
+            angle = math.pi + 2 * math.pi * player.seat / count
+            center = (int(x + math.cos(angle) * radius * 1.5), int(y + math.sin(angle) * radius * 1.5))
+            pygame.draw.circle(self.surface, player.color, center, radius)
+
+        label = renderer.atlas.label(f"#{game.seed}  回合 {game.turn_count}")
+        self.surface.blit(label, (4, 2))
+        if game.game_over and game.winner:
+            winner = renderer.atlas.label(f"{game.winner.name} 获胜", game.winner.color)
+            self.surface.blit(winner, winner.get_rect(center=(self.rect.width / 2, self.rect.height / 2)))
+        pygame.draw.rect(self.surface, GRAY, self.surface.get_rect(), 1)
+        self.dirty = False
+
+
+class SpectatorWall:
+    """观战墙窗口"""
+
+    def __init__(self, args):
+        self.args = args
+        init_display()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption(f"大富翁游戏 - 观战墙（{args.boards}局）")
+        self.clock = pygame.time.Clock()
+        self.renderer = Renderer(self.screen)
+        self.screen.fill(WHITE)
+
+        columns = math.ceil(math.sqrt(args.boards))
+        rows = math.ceil(args.boards / columns)
+        width, height = WINDOW_WIDTH // columns, WINDOW_HEIGHT // rows
+        self.views = [
+            BoardView(pygame.Rect((i % columns) * width, (i // columns) * height, width, height))
+            for i in range(args.boards)
+        ]
+
+        self._next_redraw = 0
+
+        self.queue = multiprocessing.Queue()
+        self.stop_event = multiprocessing.Event()
+        workers = max(1, min(args.workers, args.boards))
+        self.workers = [
+            multiprocessing.Process(
+                target=_worker,
+                args=(list(range(w, args.boards, workers)), args, self.queue, self.stop_event),
+                daemon=True,
+            )
+            for w in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def _drain_updates(self, budget=0.004):
+        """取出已到达的增量，最多占用budget秒，剩余的留到下一帧"""
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            try:
+                updates = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            for update in updates:
+                view = self.views[update[1]]
+                if update[0] == "init":
+                    view.reset(update[2], update[3])
+                else:
+                    view.apply(update[2])
+
+    def _redraw_dirty(self, budget=0.006):
+        """
+        重绘有变化的缩略图，最多占用budget秒以保证帧率
+        从上一帧停下的位置轮流重绘，推进过快时各格的刷新率一起下降而不会有格子饿死
+        """
+        deadline = time.perf_counter() + budget
+        count = len(self.views)
+        for offset in range(count):
+            view = self.views[(self._next_redraw + offset) % count]
+            if view.game is None or not view.dirty:
+                continue
+            if time.perf_counter() >= deadline:
+                self._next_redraw = (self._next_redraw + offset) % count
+                return
+            view.redraw(self.renderer)
+
+    def run(self, duration=None):
+        start = time.perf_counter()
+        frames = 0
+        running = True
+        while running:
+            self.clock.tick(FPS)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+            self._drain_updates()
+
+            self._redraw_dirty()
+            self.screen.blits([(view.surface, view.rect) for view in self.views], False)
+            pygame.display.flip()
+
+            frames += 1
+            if duration is not None and time.perf_counter() - start >= duration:
+                running = False
+        elapsed = time.perf_counter() - start
+        self.close()
+        return frames / elapsed
+
+    def close(self):
+        self.stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout=2)
+            if worker.is_alive():
+                worker.terminate()
+        pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="多局观战墙")
+    parser.add_argument("--boards", type=int, default=16, help="同时显示的对局数")
+    parser.add_argument("--ai", type=int, default=4, help="每局AI玩家数")
+    parser.add_argument("--tiles", type=int, default=TOTAL_TILES)
+    parser.add_argument("--board-seed", type=int, default=0, help="地图种子（所有对局共用）")
+    parser.add_argument("--speed", type=float, default=4.0, help="每局每秒推进的回合数")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--seed", type=int, default=0, help="第一局的种子，其余依次递增")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="工作进程数")
+    parser.add_argument("--duration", type=float, help="运行指定秒数后退出并打印平均帧率")
+    args = parser.parse_args(argv)
+
+    fps = SpectatorWall(args).run(args.duration)
+    if args.duration is not None:
+        print(f"平均帧率: {fps:.1f} FPS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""地块贴图缓存
+
+地块底色与边框按 (尺寸, 颜色) 预先渲染，地块编号与等级文字按文本预先渲染，
+绘制地图时只需把缓存的贴图批量blit到屏幕。
+颜色与等级本身就是缓存键，地块易主或升级时自然取到新的贴图，无需逐块失效。
+文字贴图与地块底图分开缓存：文字字号固定，缩放时不必重新渲染；
+编号比地块宽时也能像逐个绘制时一样超出地块边界。
+"""
+
+from collections import OrderedDict
+import pygame
+from config import BLACK
+
+LEVEL_TEXT_COLOR = (100, 100, 100)
+
+
+class TileAtlas:
+    """地块贴图缓存"""
+
+    def __init__(self, font, max_labels=8192, max_tiles=1024):
+        self.font = font
+        self.max_labels = max_labels
+        self.max_tiles = max_tiles
+        self._tiles = {}
+        self._labels = OrderedDict()
+
+    def tile(self, size, color):
+        """地块底图（底色与边框）"""
+        key = (size, color)
+        surface = self._tiles.get(key)
+        if surface is None:
+            if len(self._tiles) >= self.max_tiles:
+                # 持续缩放会产生大量尺寸，直接清空重建即可
+                self._tiles.clear()
+            surface = pygame.Surface((size, size))
+            surface.fill(color)
+            if size >= 6:
+                pygame.draw.rect(surface, BLACK, surface.get_rect(), 2 if size >= 12 else 1)
+            self._tiles[key] = surface
+        return surface
+
+    def label(self, text, color=BLACK):
+        """文字贴图，按最近最少使用淘汰"""
+        key = (text, color)
+        surface = self._labels.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self._labels[key] = surface
+            if len(self._labels) > self.max_labels:
+                self._labels.popitem(last=False)
+        else:
+            self._labels.move_to_end(key)
+        return surface
+
+    def tile_blits(self, x, y, size, color, index, level, draw_text):
+        """返回以(x, y)为中心绘制一个地块所需的 (贴图, 位置) 列表"""
+        left = int(x - size / 2)
+        top = int(y - size / 2)
+        blits = [(self.tile(size, color), (left, top))]
+        if not draw_text:
+            return blits
+        text = self.label(str(index))
+        blits.append((text, text.get_rect(center=(x, y))))
+        if level is not None:
+            level_text = self.label(f"Lv{level}", LEVEL_TEXT_COLOR)
+            blits.append((level_text, level_text.get_rect(center=(x, y + 8))))
+        return blits